@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+# Beniamin Dudek <beniamin.dudek@yahoo.com, github.com/thinkofher>
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from intcode import (
+    ENGINES,
+    Engine,
+    IntcodeComputer,
+    ProfilingEngine,
+    load_intcode,
+)
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# prepared workload, ready to be run once
+Run = Callable[[], object]
+
+
+class Workload(NamedTuple):
+    name: str
+    # gets engine, loads everything workload needs and returns its run
+    prepare: Callable[[Engine], Run]
+
+
+class Result(NamedTuple):
+    workload: str
+    engine: str
+    instructions: int
+    seconds: float
+    instructions_per_second: float
+    peak_memory: int
+    startup: float
+
+
+def _import_day(day: int) -> None:
+    # modules of day solutions import each other as top level modules
+    sys.path.insert(0, os.path.join(ROOT_DIR, f"day_{day:02}"))
+
+
+def _computer(intcode: List[int], engine: Engine) -> IntcodeComputer:
+    computer = IntcodeComputer(intcode)
+    computer.engine = engine
+    return computer
+
+
+def arithmetic_loop(iterations: int) -> List[int]:
+    """Sum of numbers below iterations, in a tight loop."""
+    return [
+        1101, 0, 0, 100,
+        1101, 0, 0, 101,
+        1, 100, 101, 101,
+        1001, 100, 1, 100,
+        1007, 100, iterations, 102,
+        1005, 102, 8,
+        4, 101,
+        99,
+    ]
+
+
+def echo_loop(iterations: int) -> List[int]:
+    """Read a value and put out its double, iterations times."""
+    return [
+        3, 100,
+        102, 2, 100, 101,
+        4, 101,
+        1001, 102, 1, 102,
+        1007, 102, iterations, 103,
+        1005, 103, 0,
+        99,
+    ]
+
+
+# reads n and puts out n-th Fibonacci number, computed with recursive
+# calls, which keep their frames on the relative base stack
+FIBONACCI = [
+    3, 73, 109, 74, 21001, 73, 0, 1, 21101, 15, 0, 0, 1105, 1, 18, 204,
+    2, 99, 21207, 1, 2, 3, 1206, 3, 32, 21201, 1, 0, 2, 2105, 1, 0, 21201,
+    1, -1, 5, 21101, 45, 0, 4, 109, 4, 1105, 1, 18, 109, -4, 21201, 6, 0,
+    3, 21201, 1, -2, 5, 21101, 64, 0, 4, 109, 4, 1105, 1, 18, 109, -4,
+    22201, 3, 6, 2, 2105, 1, 0, 0,
+]
+
+
+def synthetic_workloads(scale: int) -> List[Workload]:
+    loop = arithmetic_loop(200000 * scale)
+    echo_iterations = 20000 * scale
+    echo = echo_loop(echo_iterations)
+    depth = 18 + scale
+
+    return [
+        Workload(
+            "arithmetic-loop",
+            lambda engine: _computer(list(loop), engine).run_until_halt,
+        ),
+        Workload(
+            "recursion",
+            lambda engine: partial(
+                _computer(list(FIBONACCI), engine).run_until_halt, (depth,)
+            ),
+        ),
+        Workload(
+            "heavy-io",
+            lambda engine: partial(
+                _computer(list(echo), engine).run_until_halt,
+                range(echo_iterations),
+            ),
+        ),
+    ]
+
+
+def boost_workload(filename: str, mode: int, name: str) -> Workload:
+    def prepare(engine: Engine) -> Run:
+        computer = _computer(load_intcode(filename), engine)
+        return lambda: computer.run_until_halt((mode,))
+
+    return Workload(name, prepare)
+
+
+def robot_workload(filename: str) -> Workload:
+    _import_day(11)
+    from robot import Robot
+
+    def prepare(engine: Engine) -> Run:
+        computer = _computer(load_intcode(filename), engine)
+        computer.io_wrapper = Robot()
+        return computer.compute_all
+
+    return Workload("day11-robot", prepare)
+
+
+def breakout_workload(filename: str) -> Workload:
+    _import_day(13)
+    from game import IOGameBot
+
+    def prepare(engine: Engine) -> Run:
+        intcode = load_intcode(filename)
+        intcode[0] = 2  # game mode
+        computer = _computer(intcode, engine)
+        computer.io_wrapper = IOGameBot(0, render_every=0)
+
+        def run() -> None:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                computer.compute_all()
+
+        return run
+
+    return Workload("day13-breakout", prepare)
+
+
+def feedback_workload(filename: str) -> Workload:
+    _import_day(7)
+    from amplifiers import AmplifiersFeedbackLoopSoftware
+
+    def prepare(engine: Engine) -> Run:
+        software = AmplifiersFeedbackLoopSoftware(
+            load_intcode(filename), engine
+        )
+        return software.run_software
+
+    return Workload("day07-feedback", prepare)
+
+
+def count_instructions(workload: Workload) -> int:
+    engine = ProfilingEngine()
+    workload.prepare(engine)()
+    return engine.profile.instructions
+
+
+def measure(
+    workload: Workload, engine_name: str, instructions: int, repeat: int
+) -> Result:
+    """Best time and startup of repeated runs and peak memory of one."""
+    seconds, startup = float("inf"), float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run = workload.prepare(ENGINES[engine_name]())
+        prepared = time.perf_counter()
+        run()
+        finished = time.perf_counter()
+
+        startup = min(startup, prepared - started)
+        seconds = min(seconds, finished - prepared)
+
+    # tracing slows everything down, so it gets its own run
+    tracemalloc.start()
+    try:
+        workload.prepare(ENGINES[engine_name]())()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        workload.name,
+        engine_name,
+        instructions,
+        seconds,
+        instructions / seconds if seconds else 0.0,
+        peak_memory,
+        startup,
+    )
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Result], baseline: Dict[str, float]) -> None:
+    print(
+        f"{'workload':<18} {'engine':<10} {'instructions':>12} "
+        f"{'seconds':>9} {'instr/s':>12} {'peak KiB':>10} "
+        f"{'startup':>9}" + (f" {'speedup':>8}" if baseline else "")
+    )
+    for result in results:
+        line = (
+            f"{result.workload:<18} {result.engine:<10} "
+            f"{result.instructions:>12} {result.seconds:>9.4f} "
+            f"{result.instructions_per_second:>12.0f} "
+            f"{result.peak_memory // 1024:>10} {result.startup:>9.4f}"
+        )
+        previous = baseline.get(f"{result.workload}/{result.engine}")
+        if previous:
+            line += f" {result.instructions_per_second / previous:>7.2f}x"
+        print(line)
+
+
+def load_baseline(filename: str) -> Dict[str, float]:
+    with open(filename, "r") as f:
+        data = json.load(f)
+    return {
+        f"{result['workload']}/{result['engine']}": result[
+            "instructions_per_second"
+        ]
+        for result in data["results"]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of intcode engines.",
+    )
+    parser.add_argument("--day7", type=str, help="input of the 7th day")
+    parser.add_argument("--day9", type=str, help="input of the 9th day")
+    parser.add_argument("--day11", type=str, help="input of the 11th day")
+    parser.add_argument("--day13", type=str, help="input of the 13th day")
+    parser.add_argument(
+        "--engines",
+        type=lambda value: value.split(","),
+        help="comma separated engines to measure. default is every engine",
+        default=[name for name in ENGINES if name != "profile"],
+    )
+    parser.add_argument(
+        "--workloads",
+        type=lambda value: value.split(","),
+        help="comma separated names of workloads to run. default is all",
+        default=None,
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="number of timed runs, the best one counts. default is 3",
+        default=3,
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        help="size multiplier of synthetic workloads. default is 1",
+        default=1,
+    )
+    parser.add_argument(
+        "--json", type=str, help="save results as json to file",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        help="json file of previous run, to compare speed against",
+    )
+    args = parser.parse_args()
+
+    for engine_name in args.engines:
+        if engine_name not in ENGINES:
+            parser.error(f"There is no engine called {engine_name}.")
+
+    workloads = synthetic_workloads(args.scale)
+    if args.day7:
+        workloads.append(feedback_workload(args.day7))
+    if args.day9:
+        workloads.append(boost_workload(args.day9, 1, "day09-boost-test"))
+        workloads.append(boost_workload(args.day9, 2, "day09-boost-sensor"))
+    if args.day11:
+        workloads.append(robot_workload(args.day11))
+    if args.day13:
+        workloads.append(breakout_workload(args.day13))
+    if args.workloads is not None:
+        workloads = [w for w in workloads if w.name in args.workloads]
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results = []
+    for workload in workloads:
+        instructions = count_instructions(workload)
+        for engine_name in args.engines:
+            results.append(
+                measure(workload, engine_name, instructions, args.repeat)
+            )
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "repeat": args.repeat,
+                    "scale": args.scale,
+                    "results": [result._asdict() for result in results],
+                },
+                f,
+                indent=2,
+            )
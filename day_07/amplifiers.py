@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import factorial
+from typing import Callable, List, Optional, Sequence, Tuple, Type
+from itertools import permutations, cycle
+
+from intcode import (
+    IntcodeComputer,
+    ComputerSnapshot,
+    Coroutine,
+    Engine,
+    Status,
+    ImmutableIntcode,
+    Intcode,
+)
+from network import IntcodeNetwork
+
+Phases = Tuple[int, ...]
+# program hash, phase setting and input signal
+StageKey = Tuple[str, int, int]
+
+# software living in the worker process of parallel search
+_worker_software: Optional["AmplifierSoftware"] = None
+
+
+def _start_worker(
+    software_type: Type["AmplifierSoftware"],
+    intcode: ImmutableIntcode,
+    phases: Phases,
+    engine_type: Optional[Type[Engine]],
+) -> None:
+    global _worker_software
+    engine = engine_type() if engine_type is not None else None
+    _worker_software = software_type(list(intcode), engine, phases)
+
+
+def _run_prefix(prefix: Phases) -> Tuple[List[int], int, int]:
+    """Signals of sequences with given prefix, with stage cache hits and
+    misses counted while they were searched.
+    """
+    assert _worker_software is not None
+    cache = _worker_software.stage_cache
+    if cache is None:
+        return _worker_software.run_prefix(prefix), 0, 0
+
+    hits, misses = cache.hits, cache.misses
+    signals = _worker_software.run_prefix(prefix)
+    return signals, cache.hits - hits, cache.misses - misses
+
+
+def program_hash(intcode: Sequence[int]) -> str:
+    return hashlib.sha1(",".join(map(str, intcode)).encode()).hexdigest()
+
+
+class StageCache:
+    """Bounded LRU cache of outputs of single amplifiers."""
+
+    maxsize: int
+    hits: int
+    misses: int
+    _values: "OrderedDict[StageKey, int]"
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: StageKey, compute: Callable[[], int]) -> int:
+        try:
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            value = self._values[key] = compute()
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+            return value
+
+        self.hits += 1
+        self._values.move_to_end(key)
+        return value
+
+
+class AmplifierSoftware(ABC):
+
+    _SEQUENCE_VALUES: Phases
+    # parallel search gives every worker at least that many tasks
+    _TASKS_PER_JOB = 4
+
+    _intcode: ImmutableIntcode
+    _engine: Optional[Engine]
+    _phases: Phases
+    signals: List[int]
+    # outputs of single amplifiers, for software which can reuse them
+    stage_cache: Optional[StageCache] = None
+
+    def __init__(
+        self,
+        intcode: Intcode,
+        engine: Optional[Engine] = None,
+        phases: Optional[Sequence[int]] = None,
+    ) -> None:
+        self._intcode = tuple(intcode)
+        self._engine = engine
+        if phases is None:
+            phases = self._SEQUENCE_VALUES
+        if len(set(phases)) != len(phases):
+            raise ValueError(f"Phase settings have to be unique: {phases}.")
+        self._phases = tuple(phases)
+        self.signals = []
+
+    def _new_computer(self) -> IntcodeComputer:
+        computer = IntcodeComputer(list(self._intcode))
+        if self._engine is not None:
+            computer.engine = self._engine
+        return computer
+
+    @abstractmethod
+    def _run_sequence(self, sequence: Phases) -> int:
+        pass
+
+    def run_prefix(self, prefix: Phases) -> List[int]:
+        """Signals of every sequence starting with given phases."""
+        rest = tuple(phase for phase in self._phases if phase not in prefix)
+        return [
+            self._run_sequence(prefix + sequence)
+            for sequence in permutations(rest)
+        ]
+
+    def _prefix_length(self, jobs: int) -> int:
+        count = len(self._phases)
+        for length in range(count + 1):
+            prefixes = factorial(count) // factorial(count - length)
+            if prefixes >= jobs * self._TASKS_PER_JOB:
+                return length
+        return count
+
+    def run_software(self, jobs: int = 1) -> None:
+        if jobs <= 1:
+            self.signals += self.run_prefix(())
+            return
+
+        # workers get the program once and then only short prefixes of
+        # sequences, which they extend with every possible permutation
+        prefixes = permutations(self._phases, self._prefix_length(jobs))
+        engine_type = type(self._engine) if self._engine is not None else None
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_start_worker,
+            initargs=(type(self), self._intcode, self._phases, engine_type),
+        ) as pool:
+            for signals, hits, misses in pool.map(_run_prefix, prefixes):
+                self.signals += signals
+                # every worker has its own cache, only counts come back
+                if self.stage_cache is not None:
+                    self.stage_cache.hits += hits
+                    self.stage_cache.misses += misses
+
+    def get_max_signal(self) -> int:
+        return max(self.signals)
+
+
+class AmplifierControllerSoftware(AmplifierSoftware):
+    """Chain of amplifiers, each one run once, without feedback loop.
+
+    Output of an amplifier depends only on its phase setting and input
+    signal, so sequences sharing a prefix reuse its results from cache.
+    """
+
+    _SEQUENCE_VALUES: Phases = (0, 1, 2, 3, 4)
+    _STAGE_CACHE_SIZE = 1 << 16
+
+    _computer: IntcodeComputer
+    _initial: ComputerSnapshot
+    _program_hash: str
+    stage_cache: StageCache
+
+    def __init__(
+        self,
+        intcode: Intcode,
+        engine: Optional[Engine] = None,
+        phases: Optional[Sequence[int]] = None,
+    ) -> None:
+        super().__init__(intcode, engine, phases)
+        self._computer = self._new_computer()
+        self._initial = self._computer.snapshot()
+        self._program_hash = program_hash(self._intcode)
+        self.stage_cache = StageCache(self._STAGE_CACHE_SIZE)
+
+    def _amplify(self, phase: int, signal: int) -> int:
+        self._computer.restore(self._initial)
+        return self._computer.run_until_halt((phase, signal))[-1]
+
+    def _run_sequence(self, sequence: Phases) -> int:
+        signal = 0
+        for phase in sequence:
+            signal = self.stage_cache.get(
+                (self._program_hash, phase, signal),
+                lambda: self._amplify(phase, signal),
+            )
+        return signal
+
+
+class AmplifiersFeedbackLoopSoftware(AmplifierSoftware):
+    """Amplifiers connected in a loop, running until the last one halts.
+
+    Computers are created once and brought back to their initial
+    snapshot for every sequence.
+    """
+
+    _SEQUENCE_VALUES: Phases = (5, 6, 7, 8, 9)
+
+    _computers: List[IntcodeComputer]
+    _initial: ComputerSnapshot
+
+    def __init__(
+        self,
+        intcode: Intcode,
+        engine: Optional[Engine] = None,
+        phases: Optional[Sequence[int]] = None,
+    ) -> None:
+        super().__init__(intcode, engine, phases)
+        self._computers = [self._new_computer() for _ in self._phases]
+        self._initial = self._computers[0].snapshot()
+
+    def _computers_for(
+        self, sequence: Phases
+    ) -> List[Tuple[IntcodeComputer, int]]:
+        pairs = list(zip(self._computers, sequence))
+        for computer, _ in pairs:
+            computer.restore(self._initial)
+        return pairs
+
+    def _start_amplifier(
+        self, computer: IntcodeComputer, phase: int
+    ) -> Coroutine:
+        amplifier = computer.coroutine((phase,))
+        # run until amplifier asks for its first signal
+        next(amplifier)
+        return amplifier
+
+    def _run_sequence(self, sequence: Phases) -> int:
+        amplifiers = [
+            self._start_amplifier(computer, phase)
+            for computer, phase in self._computers_for(sequence)
+        ]
+
+        signal = 0
+        for amplifier in cycle(amplifiers):
+            value = amplifier.send(signal)
+            if value == Status.Halted:
+                return signal
+            if isinstance(value, Status):
+                raise ValueError("Amplifier didn't put out any signal.")
+            signal = value
+        raise ValueError("There are no amplifiers.")
+
+
+class AmplifiersNetworkSoftware(AmplifiersFeedbackLoopSoftware):
+    """Feedback loop running amplifiers as tasks of IntcodeNetwork."""
+
+    def _run_sequence(self, sequence: Phases) -> int:
+        network = IntcodeNetwork()
+        for tag, (computer, phase) in enumerate(self._computers_for(sequence)):
+            network.add_computer(tag, computer, (phase,))
+        tags = list(range(len(sequence)))
+        network.ring(tags)
+
+        # first amplifier gets zero signal right after its phase setting
+        network.add_input(tags[0], 0)
+        outputs = asyncio.run(network.run())
+        return outputs[tags[-1]][-1]
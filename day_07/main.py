@@ -1,11 +1,18 @@
 #!/usr/bin/env python
 # Beniamin Dudek <beniamin.dudek@yahoo.com, github.com/thinkofher>
 import argparse
-from typing import List
+import os
+import sys
 
-from computer import (
+# shared intcode package lives in the root of the repository
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from intcode import ENGINES, load_intcode
+from amplifiers import (
     AmplifierControllerSoftware,
     AmplifiersFeedbackLoopSoftware,
+    AmplifiersNetworkSoftware,
 )
 
 if __name__ == "__main__":
@@ -20,22 +27,49 @@ if __name__ == "__main__":
     parser.add_argument(
         "software",
         type=str,
-        help="name of the software to run on intcode computer (acs/acsl)",
-        choices=["acs", "acsl"],
+        help="name of the software to run on intcode computer (acs/acsl/acsn)",
+        choices=["acs", "acsl", "acsn"],
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        help="engine executing intcode. default is object",
+        default="object",
+        choices=ENGINES.keys(),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="number of processes searching phase settings. default is 1",
+        default=1,
+    )
+    parser.add_argument(
+        "--phases",
+        type=lambda value: tuple(map(int, value.split(","))),
+        help="comma separated phase settings, one for every amplifier",
+        default=None,
     )
     args = parser.parse_args()
 
-    intcode = []  # type: List[str]
-    with open(args.filename, "r") as f:
-        for line in f.readlines():
-            intcode += line.strip("\n").split(",")
+    intcode = load_intcode(args.filename)
+
+    engine = ENGINES[args.engine]()
 
     if args.software == "acs":
-        acs = AmplifierControllerSoftware(intcode)
-        acs.run_software()
+        acs = AmplifierControllerSoftware(intcode, engine, args.phases)
+        acs.run_software(args.jobs)
         print(acs.get_max_signal())
+        print(
+            f"Stage cache: {acs.stage_cache.hits} hits, "
+            f"{acs.stage_cache.misses} misses."
+        )
 
     if args.software == "acsl":
-        acsl = AmplifiersFeedbackLoopSoftware(intcode)
-        acsl.run_software()
+        acsl = AmplifiersFeedbackLoopSoftware(intcode, engine, args.phases)
+        acsl.run_software(args.jobs)
         print(acsl.get_max_signal())
+
+    if args.software == "acsn":
+        acsn = AmplifiersNetworkSoftware(intcode, engine, args.phases)
+        acsn.run_software(args.jobs)
+        print(acsn.get_max_signal())
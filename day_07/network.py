@@ -0,0 +1,128 @@
+import asyncio
+from typing import Dict, Hashable, Iterable, List, Sequence
+
+from intcode import IntcodeComputer, Status
+
+
+class IntcodeNetwork:
+    """Intcode computers running as asyncio tasks and wired with queues.
+
+    Every computer has its own input queue. Outputs of a computer are
+    put into queues of all computers it is connected to, so any graph
+    can be built with connect(), ring() and chain(). Computer runs with
+    run_until_input, so control goes back to the event loop only when
+    it waits for input or halts, not after every instruction.
+    """
+
+    computers: Dict[Hashable, IntcodeComputer]
+    outputs: Dict[Hashable, List[int]]
+    _inboxes: Dict[Hashable, "asyncio.Queue[int]"]
+    _links: Dict[Hashable, List[Hashable]]
+    _initial_inputs: Dict[Hashable, List[int]]
+    _alive: int
+    _waiting: int
+    _idle: asyncio.Event
+
+    def __init__(self) -> None:
+        self.computers = {}
+        self.outputs = {}
+        self._links = {}
+        self._initial_inputs = {}
+
+    def add_computer(
+        self,
+        name: Hashable,
+        computer: IntcodeComputer,
+        inputs: Iterable[int] = (),
+    ) -> None:
+        if name in self.computers:
+            raise ValueError(f"Computer {name} is already in the network.")
+        self.computers[name] = computer
+        self.outputs[name] = []
+        self._links[name] = []
+        self._initial_inputs[name] = list(inputs)
+
+    def add_input(self, name: Hashable, value: int) -> None:
+        """Queue value for computer before the network starts."""
+        self._initial_inputs[name].append(value)
+
+    def connect(self, source: Hashable, target: Hashable) -> None:
+        """Send every output of source computer to target computer."""
+        if source not in self.computers or target not in self.computers:
+            raise ValueError(f"Can't connect {source} with {target}.")
+        self._links[source].append(target)
+
+    def chain(self, names: Sequence[Hashable]) -> None:
+        for source, target in zip(names, names[1:]):
+            self.connect(source, target)
+
+    def ring(self, names: Sequence[Hashable]) -> None:
+        self.chain(names)
+        self.connect(names[-1], names[0])
+
+    def _is_idle(self) -> bool:
+        # every computer still running waits for input nobody sends
+        return self._waiting == self._alive and all(
+            inbox.empty() for inbox in self._inboxes.values()
+        )
+
+    async def _run_computer(self, name: Hashable) -> None:
+        try:
+            await self._execute(name)
+        except Exception:
+            # stop the whole network instead of waiting for this computer
+            self._idle.set()
+            raise
+
+    async def _execute(self, name: Hashable) -> None:
+        computer = self.computers[name]
+        inbox = self._inboxes[name]
+        targets = [self._inboxes[target] for target in self._links[name]]
+        inputs = self._initial_inputs[name]
+
+        while True:
+            outputs, status = computer.run_until_input(inputs)
+            self.outputs[name] += outputs
+            for target in targets:
+                for value in outputs:
+                    target.put_nowait(value)
+
+            if status == Status.Halted:
+                self._alive -= 1
+                if self._alive == 0 or self._is_idle():
+                    self._idle.set()
+                return
+
+            self._waiting += 1
+            if self._is_idle():
+                self._idle.set()
+            inputs = [await inbox.get()]
+            self._waiting -= 1
+
+            # take everything which is already waiting in the queue
+            while not inbox.empty():
+                inputs.append(inbox.get_nowait())
+
+    async def run(self) -> Dict[Hashable, List[int]]:
+        """Run until every computer halts or the network goes idle.
+
+        Returns all values put out by every computer.
+        """
+        self._inboxes = {name: asyncio.Queue() for name in self.computers}
+        self._alive = len(self.computers)
+        self._waiting = 0
+        self._idle = asyncio.Event()
+
+        tasks = [
+            asyncio.ensure_future(self._run_computer(name))
+            for name in self.computers
+        ]
+        await self._idle.wait()
+
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return self.outputs
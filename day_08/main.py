@@ -3,6 +3,19 @@
 from typing import List
 import argparse
 import enum
+import os
+import sys
+
+import numpy as np
+
+# image writer is shared with intcode days, from the root of repository
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from intcode import write_image
+
+# colors of pixels in saved images, transparent ones are gray
+PALETTE = ((0, 0, 0), (255, 255, 255), (128, 128, 128))
 
 
 @enum.unique
@@ -11,47 +24,59 @@ class Color(enum.Enum):
     White = 1
     Transparent = 2
 
-    @staticmethod
-    def visualize(color) -> str:
-        if color == Color.Transparent:
-            return '?'
-        if color == Color.Black:
-            return '.'
-        if color == Color.White:
-            return 'x'
 
+# symbols of colors, in order of their values
+_SYMBOLS = bytes.maketrans(bytes(range(len(Color))), b".x?")
+
+
+def read_layers(filename: str, width: int, height: int) -> np.ndarray:
+    """Digits of the image as array of layers, rows and columns."""
+    with open(filename, "rb") as f:
+        digits = bytearray(f.read()).translate(None, b"\r\n")
 
-def check_for_corruption(chunked_image_data: List[List[Color]]) -> int:
-    data = chunked_image_data[:]
-    data.sort(key=lambda lst: lst.count(Color.Black))
-    return data[0].count(Color.Transparent) * data[0].count(Color.White)
+    # digits are turned into colors in place, without another copy
+    pixels = np.frombuffer(digits, dtype=np.uint8)
+    pixels -= ord("0")
+    if pixels.size % (width * height):
+        raise ValueError("Image data doesn't fill whole layers.")
+    if pixels.size and pixels.max() >= len(Color):
+        raise ValueError("Image data has unknown colors.")
+    return pixels.reshape(-1, height, width)
 
 
-def remove_transparent(image_data: List[Color]) -> List[Color]:
-    return list(filter(lambda pixel: pixel != Color.Transparent, image_data))
+def color_counts(layers: np.ndarray) -> np.ndarray:
+    """Number of pixels of every color in every layer."""
+    return np.array(
+        [
+            np.bincount(layer.ravel(), minlength=len(Color))
+            for layer in layers
+        ]
+    ).reshape(-1, len(Color))
 
 
-def visualize(image: List[Color], width: int) -> str:
-    pixels = list(map(Color.visualize, image))
-    pixels_chunks = chunks(pixels, width)
-    return '\n'.join(map(lambda lst: ''.join(lst), pixels_chunks))
+def check_for_corruption(layers: np.ndarray) -> int:
+    counts = color_counts(layers)
+    layer = counts[np.argmin(counts[:, Color.Black.value])]
+    return int(layer[Color.Transparent.value] * layer[Color.White.value])
 
 
-def get_top_visible_pixels(
-    chunked_image_data: List[List[Color]],
-) -> List[Color]:
+def get_top_visible_pixels(layers: np.ndarray) -> np.ndarray:
+    """Pixels of the first layer which isn't transparent at them.
 
-    pixels_columns = [
-        [lst.pop(0) for lst in image_data_chunked[:]]
-        for _ in range(len(image_data_chunked[0]))
-    ]
-    pixels_without_transparent = map(remove_transparent, pixels_columns)
-    top_pixels = [lst.pop(0) for lst in pixels_without_transparent]
-    return top_pixels
+    Pixels transparent in every layer stay transparent.
+    """
+    first = np.argmax(layers != Color.Transparent.value, axis=0)
+    return np.take_along_axis(layers, first[None], axis=0)[0]
 
 
-def chunks(lst, n: int):
-    return [lst[i:i + n] for i in range(0, len(lst), n)]
+def visualize(image: np.ndarray) -> str:
+    return "\n".join(
+        row.tobytes().translate(_SYMBOLS).decode() for row in image
+    )
+
+
+def image_rows(image: np.ndarray) -> List[bytes]:
+    return [row.tobytes() for row in image]
 
 
 if __name__ == "__main__":
@@ -67,17 +92,18 @@ if __name__ == "__main__":
     parser.add_argument(
         "--height", type=int, help="image height", default=6,
     )
+    parser.add_argument(
+        "--image",
+        type=str,
+        help="save decoded image to pbm, pgm or png file",
+    )
     args = parser.parse_args()
 
-    image_data = []
-    with open(args.filename, "r") as f:
-        for line in f.readlines():
-            image_data += list(
-                map(lambda value: Color(int(value)), line.strip("\n"))
-            )
-
-    image_data_chunked = chunks(image_data, args.height * args.width)
-    print(check_for_corruption(image_data_chunked))
+    layers = read_layers(args.filename, args.width, args.height)
+    print(check_for_corruption(layers))
 
-    visible_pixels = get_top_visible_pixels(image_data_chunked)
-    print(visualize(visible_pixels, args.width))
+    visible_pixels = get_top_visible_pixels(layers)
+    if args.image:
+        write_image(args.image, image_rows(visible_pixels), PALETTE)
+    else:
+        print(visualize(visible_pixels))
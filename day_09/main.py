@@ -1,9 +1,14 @@
 #!/usr/bin/env python
 # Beniamin Dudek <beniamin.dudek@yahoo.com, github.com/thinkofher>
 import argparse
-from typing import List
+import os
+import sys
 
-from computer import IntcodeComputer
+# shared intcode package lives in the root of the repository
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from intcode import IntcodeComputer, ProfilingEngine, ENGINES, load_intcode
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -12,11 +17,49 @@ if __name__ == "__main__":
     parser.add_argument(
         "filename", type=str, help="name of the file with input data",
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        help="engine executing intcode. default is object",
+        default="object",
+        choices=ENGINES.keys(),
+    )
+    parser.add_argument(
+        "--memory-usage",
+        action="store_true",
+        help="print memory used by the program after it halts",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run with profiling engine and print hot spots of the program",
+    )
+    parser.add_argument(
+        "--collapsed-stacks",
+        type=str,
+        help="with --profile, save collapsed stacks for flamegraph to file",
+    )
     args = parser.parse_args()
 
-    intcode = []  # type: List[str]
-    with open(args.filename, "r") as f:
-        for line in f.readlines():
-            intcode += line.strip("\n").split(",")
+    intcode = load_intcode(args.filename)
+
+    computer = IntcodeComputer(intcode)
+    computer.engine = ENGINES[args.engine]()
+    if args.profile:
+        computer.engine = ProfilingEngine()
+    computer.compute_all()
+
+    if args.memory_usage:
+        usage = computer.intcode_memory.usage()
+        print(
+            f"Memory: {usage.base_cells} cells of base memory, "
+            f"{usage.sparse_pages} sparse pages "
+            f"({usage.sparse_cells} cells)."
+        )
 
-    IntcodeComputer(intcode).compute_all()
+    if isinstance(computer.engine, ProfilingEngine):
+        print(computer.engine.profile.report())
+        if args.collapsed_stacks:
+            computer.engine.profile.write_collapsed_stacks(
+                args.collapsed_stacks
+            )
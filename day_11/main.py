@@ -1,31 +1,50 @@
 #!/usr/bin/env python
 # Beniamin Dudek <beniamin.dudek@yahoo.com, github.com/thinkofher>
 import argparse
-from typing import List, Dict
+import os
+import sys
+import time
+from typing import Dict, List
 
-from computer import IntcodeComputer
-from robot import Robot, Point, Color
+# shared intcode package lives in the root of the repository
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from intcode import (
+    IntcodeComputer,
+    TerminalRenderer,
+    ENGINES,
+    load_intcode,
+    write_image,
+)
+from robot import GridRobot, Robot, Point, Color, PALETTE, drive
 
 
 def visualize_table(table: Dict[Point, Color]) -> None:
-    max_x = max(map(lambda p: p.x, table.keys()))
-    min_x = min(map(lambda p: p.x, table.keys()))
-    max_y = max(map(lambda p: p.y, table.keys()))
-    min_y = min(map(lambda p: p.y, table.keys()))
-
-    for y in range(min_y, max_y+1):
-        for x in range(min_x, max_x+1):
-            color = Color.Black
-            try:
-                color = table[Point(x, y)]
-            except KeyError:
-                pass
-
-            if color == Color.White:
-                print('#', end='')
-            else:
-                print(' ', end='')
-        print('\n', end='')
+    xs = [point.x for point in table]
+    ys = [point.y for point in table]
+
+    rows = [
+        "".join(
+            '#' if table.get(Point(x, y)) == Color.White else ' '
+            for x in range(min(xs), max(xs)+1)
+        )
+        for y in range(min(ys), max(ys)+1)
+    ]
+    TerminalRenderer().render(rows)
+
+
+def table_rows(table: Dict[Point, Color], default: Color) -> List[bytes]:
+    xs = [point.x for point in table]
+    ys = [point.y for point in table]
+
+    return [
+        bytes(
+            table.get(Point(x, y), default)
+            for x in range(min(xs), max(xs)+1)
+        )
+        for y in range(min(ys), max(ys)+1)
+    ]
 
 
 if __name__ == "__main__":
@@ -41,22 +60,65 @@ if __name__ == "__main__":
         help="set default color",
         choices=["black", "white"],
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        help="engine executing intcode. default is object",
+        default="object",
+        choices=ENGINES.keys(),
+    )
+    parser.add_argument(
+        "--grid",
+        action="store_true",
+        help="keep hull in a compact grid instead of a dict",
+    )
+    parser.add_argument(
+        "--driver",
+        action="store_true",
+        help="run grid robot straight on batches of outputs, "
+        "without io handler",
+    )
+    parser.add_argument(
+        "--image",
+        type=str,
+        help="save painted hull to pbm, pgm or png file",
+    )
     args = parser.parse_args()
 
-    intcode = []  # type: List[str]
-    with open(args.filename, "r") as f:
-        for line in f.readlines():
-            intcode += line.strip("\n").split(",")
+    intcode = load_intcode(args.filename)
 
     if args.default_color == "black":
         default_color = Color.Black
     else:
         default_color = Color.White
 
-    robot = Robot(default_color=default_color)
     computer = IntcodeComputer(intcode)
+    computer.engine = ENGINES[args.engine]()
+
+    if args.grid or args.driver:
+        grid_robot = GridRobot(default_color=default_color)
+        if args.driver:
+            stats = drive(computer, grid_robot)
+        else:
+            started = time.perf_counter()
+            computer.io_wrapper = grid_robot
+            computer.compute_all()
+            stats = grid_robot.stats(time.perf_counter() - started)
+
+        print(stats.report(), end='\n'*2)
+        if args.image:
+            write_image(args.image, grid_robot.hull.rows(), PALETTE)
+        else:
+            TerminalRenderer().render(grid_robot.hull.lines())
+        sys.exit(0)
+
+    robot = Robot(default_color=default_color)
     computer.io_wrapper = robot
     computer.compute_all()
 
     print('Robot did', len(robot.table.items()), 'operations.', end='\n'*2)
-    visualize_table(robot.table)
+    if args.image:
+        rows = table_rows(robot.table, default_color)
+        write_image(args.image, rows, PALETTE)
+    else:
+        visualize_table(robot.table)
@@ -1,7 +1,8 @@
 import enum
-from typing import NamedTuple, Dict
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from handler import IOHandler
+from intcode import IntcodeComputer, IOHandler, Status
 
 
 class Point(NamedTuple):
@@ -34,24 +35,19 @@ class Command(NamedTuple):
     instruction: Instruction
 
 
-def turn(dir: Direction, instr: Instruction):
-    if dir == Direction.North:
-        if instr == Instruction.TurnLeft:
-            return Direction.West
-        else:
-            return Direction.East
+# colors of panels in images of the hull
+PALETTE = ((0, 0, 0), (255, 255, 255))
 
-    elif dir == Direction.East:
-        if instr == Instruction.TurnLeft:
-            return Direction.North
-        else:
-            return Direction.South
+# unit vectors of directions, in order of their values
+_VECTORS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+# new direction by the current one and instruction
+_TURNS = tuple(
+    ((direction - 1) % 4, (direction + 1) % 4) for direction in Direction
+)
 
-    elif dir == Direction.South:
-        return turn(Direction.North, Instruction(not instr))
 
-    else:
-        return turn(Direction.East, Instruction(not instr))
+def turn(dir: Direction, instr: Instruction) -> Direction:
+    return Direction(_TURNS[dir][instr])
 
 
 class Robot(IOHandler):
@@ -105,3 +101,245 @@ class Robot(IOHandler):
             self.position = Point(curr_pos.x - 1, curr_pos.y)
         else:
             self.position = Point(curr_pos.x + 1, curr_pos.y)
+
+
+class DriveStats(NamedTuple):
+    painted: int
+    # left, top, right and bottom of painted panels
+    bounds: Optional[Tuple[int, int, int, int]]
+    steps: int
+    seconds: float
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.seconds if self.seconds else 0.0
+
+    def report(self) -> str:
+        if self.bounds is None:
+            box = "nothing"
+        else:
+            left, top, right, bottom = self.bounds
+            box = (
+                f"{right - left + 1}x{bottom - top + 1} "
+                f"from ({left}, {top}) to ({right}, {bottom})"
+            )
+        return (
+            f"Painted {self.painted} panels, bounding box {box}.\n"
+            f"{self.steps} steps in {self.seconds:.3f}s "
+            f"({self.steps_per_second:.0f} steps/s)."
+        )
+
+
+class Hull:
+    """Colors of hull panels in a growable grid of bytes.
+
+    Grid starts around the origin and doubles towards the side which
+    the robot leaves it on. Panels painted at least once are marked
+    in a bitset, so they are counted without any dict.
+    """
+
+    # coordinates of the top left panel of the grid
+    left: int
+    top: int
+    width: int
+    height: int
+    default: int
+    cells: bytearray
+    painted: bytearray
+    painted_count: int
+
+    def __init__(self, default: int = 0, size: int = 64) -> None:
+        self.left = self.top = -(size // 2)
+        self.width = self.height = size
+        self.default = default
+        self.cells = bytearray([default]) * (size * size)
+        self.painted = bytearray((size * size + 7) >> 3)
+        self.painted_count = 0
+
+    def get(self, x: int, y: int) -> int:
+        column, row = x - self.left, y - self.top
+        if 0 <= column < self.width and 0 <= row < self.height:
+            return self.cells[row * self.width + column]
+        return self.default
+
+    def paint(self, x: int, y: int, color: int) -> None:
+        column, row = x - self.left, y - self.top
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            self._grow(x, y)
+            column, row = x - self.left, y - self.top
+        index = row * self.width + column
+        self.cells[index] = color
+
+        mask = 1 << (index & 7)
+        if not self.painted[index >> 3] & mask:
+            self.painted[index >> 3] |= mask
+            self.painted_count += 1
+
+    def is_painted(self, x: int, y: int) -> bool:
+        column, row = x - self.left, y - self.top
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            return False
+        index = row * self.width + column
+        return bool(self.painted[index >> 3] >> (index & 7) & 1)
+
+    def _painted_indexes(self) -> Iterator[int]:
+        for position, byte in enumerate(self.painted):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield position << 3 | bit
+
+    def _grow(self, x: int, y: int) -> None:
+        left, top = self.left, self.top
+        right, bottom = left + self.width, top + self.height
+        if x < left:
+            left = min(x, right - 2 * self.width)
+        elif x >= right:
+            right = max(x + 1, left + 2 * self.width)
+        if y < top:
+            top = min(y, bottom - 2 * self.height)
+        elif y >= bottom:
+            bottom = max(y + 1, top + 2 * self.height)
+
+        width, height = right - left, bottom - top
+        cells = bytearray([self.default]) * (width * height)
+        painted = bytearray((width * height + 7) >> 3)
+        dx, dy = self.left - left, self.top - top
+        for row in range(self.height):
+            old = row * self.width
+            new = (row + dy) * width + dx
+            cells[new:new + self.width] = self.cells[old:old + self.width]
+        for index in self._painted_indexes():
+            row, column = divmod(index, self.width)
+            new = (row + dy) * width + column + dx
+            painted[new >> 3] |= 1 << (new & 7)
+
+        self.left, self.top = left, top
+        self.width, self.height = width, height
+        self.cells, self.painted = cells, painted
+
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """Left, top, right and bottom of painted panels, inclusive."""
+        rows, columns = set(), set()
+        for index in self._painted_indexes():
+            row, column = divmod(index, self.width)
+            rows.add(row)
+            columns.add(column)
+        if not rows:
+            return None
+        return (
+            self.left + min(columns),
+            self.top + min(rows),
+            self.left + max(columns),
+            self.top + max(rows),
+        )
+
+    def rows(self) -> List[bytes]:
+        """Colors of panels around the painted ones, sliced from grid.
+
+        Panels which were never painted have the default color.
+        """
+        bounds = self.bounds()
+        if bounds is None:
+            return []
+        left, top, right, bottom = bounds
+        start = left - self.left
+        end = start + right - left + 1
+        return [
+            bytes(self.cells[row * self.width + start:row * self.width + end])
+            for row in range(top - self.top, bottom - self.top + 1)
+        ]
+
+    def lines(self, symbols: str = " #") -> List[str]:
+        """Painted panels as text, blank where nothing was painted."""
+        bounds = self.bounds()
+        if bounds is None:
+            return []
+        left, top, right, bottom = bounds
+        return [
+            "".join(
+                symbols[self.get(x, y)] if self.is_painted(x, y) else " "
+                for x in range(left, right + 1)
+            )
+            for y in range(top, bottom + 1)
+        ]
+
+
+class GridRobot(IOHandler):
+    """Robot painting Hull, which keeps its state in plain integers."""
+
+    hull: Hull
+    x: int
+    y: int
+    direction: int
+    steps: int
+    # color of the output pair which waits for its instruction
+    _color: Optional[int]
+
+    def __init__(self, default_color=Color.Black) -> None:
+        self.hull = Hull(int(default_color))
+        self.x = self.y = 0
+        self.direction = Direction.North.value
+        self.steps = 0
+        self._color = None
+
+    def stats(self, seconds: float) -> DriveStats:
+        hull = self.hull
+        return DriveStats(
+            hull.painted_count, hull.bounds(), self.steps, seconds
+        )
+
+    def get_input(self) -> int:
+        return self.hull.get(self.x, self.y)
+
+    def set_output(self, value: int) -> None:
+        if self._color is None:
+            self._color = value
+            return
+
+        self.hull.paint(self.x, self.y, self._color)
+        self._color = None
+        self.direction = _TURNS[self.direction][value]
+        dx, dy = _VECTORS[self.direction]
+        self.x += dx
+        self.y += dy
+        self.steps += 1
+
+
+def drive(computer: IntcodeComputer, robot: GridRobot) -> DriveStats:
+    """Run robot straight on outputs of computer, without any handler.
+
+    Computer runs until it asks for the next camera reading, then all
+    output pairs it put out meanwhile are executed in one pass. It is
+    the batch counterpart of GridRobot used as io_wrapper, so both can
+    be compared by their DriveStats. Entering the engine for every
+    batch costs more than handler calls when program asks for a reading
+    after every pair, so then it is the slower of the two.
+    """
+    hull = robot.hull
+    paint, look = hull.paint, hull.get
+    x, y, direction = robot.x, robot.y, robot.direction
+    steps = 0
+    # color put out at the end of batch, without its instruction yet
+    pending: List[int] = []
+    started = time.perf_counter()
+
+    while True:
+        outputs, status = computer.run_until_input((look(x, y),))
+        if pending:
+            outputs = pending + outputs
+        end = len(outputs) & ~1
+        for index in range(0, end, 2):
+            paint(x, y, outputs[index])
+            direction = _TURNS[direction][outputs[index + 1]]
+            dx, dy = _VECTORS[direction]
+            x += dx
+            y += dy
+        pending = outputs[end:]
+        steps += end >> 1
+        if status == Status.Halted:
+            break
+
+    robot.x, robot.y, robot.direction = x, y, direction
+    robot.steps += steps
+    return robot.stats(time.perf_counter() - started)
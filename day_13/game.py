@@ -1,8 +1,10 @@
+import copy
 import enum
 import time
-from typing import List, Dict, NamedTuple
+from collections import deque
+from typing import Deque, List, Dict, NamedTuple, Optional, Tuple, cast
 
-from handler import IOHandler
+from intcode import IOHandler, IntcodeComputer, Status, TerminalRenderer
 
 
 @enum.unique
@@ -21,48 +23,41 @@ class Position(NamedTuple):
 
 Tiles = Dict[Position, Tile]
 
-
-def find_tile_position(tiles: Tiles, ftile: Tile) -> Position:
-    for position, tile in tiles.items():
-        if tile == ftile:
-            return position
-
-
-def find_player_position(tiles: Tiles) -> Position:
-    return find_tile_position(tiles, Tile.HorizontalPaddle)
-
-
-def find_ball_position(tiles: Tiles) -> Position:
-    return find_tile_position(tiles, Tile.Ball)
+_TILE_SYMBOLS: Dict[Tile, str] = {
+    Tile.Empty: ".",
+    Tile.Wall: "|",
+    Tile.Block: "x",
+    Tile.HorizontalPaddle: "_",
+    Tile.Ball: "o",
+}
+# colors of tiles in images of the screen, in order of their values
+PALETTE = (
+    (0, 0, 0),
+    (128, 128, 128),
+    (200, 80, 40),
+    (60, 160, 220),
+    (255, 255, 255),
+)
+# turns row of tile values straight into their symbols
+_SYMBOLS_TABLE = bytes.maketrans(
+    bytes(tile.value for tile in _TILE_SYMBOLS),
+    "".join(_TILE_SYMBOLS.values()).encode(),
+)
 
 
 def visualize_table(tiles: Tiles, clear_screen=False, score=None) -> None:
-    max_x = max(map(lambda p: p.from_left, tiles.keys()))
-    min_x = min(map(lambda p: p.from_left, tiles.keys()))
-    max_y = max(map(lambda p: p.from_top, tiles.keys()))
-    min_y = min(map(lambda p: p.from_top, tiles.keys()))
-
-    for y in range(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            tile = Tile.Empty
-            try:
-                tile = tiles[Position(x, y)]
-            except KeyError:
-                pass
-
-            if tile == Tile.Wall:
-                print("|", end="")
-            elif tile == Tile.HorizontalPaddle:
-                print("_", end="")
-            elif tile == Tile.Ball:
-                print("o", end="")
-            elif tile == Tile.Block:
-                print("x", end="")
-            else:
-                print(".", end="")
-        print("\n", end="")
-    if score is not None:
-        print(f"Current score: {score}")
+    lefts = [position.from_left for position in tiles]
+    tops = [position.from_top for position in tiles]
+
+    rows = [
+        "".join(
+            _TILE_SYMBOLS[tiles.get(Position(x, y), Tile.Empty)]
+            for x in range(min(lefts), max(lefts) + 1)
+        )
+        for y in range(min(tops), max(tops) + 1)
+    ]
+    status = f"Current score: {score}" if score is not None else ""
+    TerminalRenderer().render(rows, status)
     if clear_screen:
         print("\033c", end="")
 
@@ -71,15 +66,113 @@ def chunks(lst, n: int):
     return [lst[i:i + n] for i in range(0, len(lst), n)]
 
 
+class Screen:
+    """Tiles of the game kept in rows of bytes.
+
+    Screen takes size of the first frame and grows only if the game
+    draws outside of it later.
+    """
+
+    width: int
+    rows: List[bytearray]
+
+    def __init__(self) -> None:
+        self.width = 0
+        self.rows = []
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+    def _grow(self, left: int, top: int) -> None:
+        if left >= self.width:
+            for row in self.rows:
+                row.extend(bytes(left + 1 - self.width))
+            self.width = left + 1
+        while top >= len(self.rows):
+            self.rows.append(bytearray(self.width))
+
+    def get(self, position: Position) -> Tile:
+        left, top = position
+        # negative index would wrap around to the other end of a row
+        if 0 <= left < self.width and 0 <= top < len(self.rows):
+            return Tile(self.rows[top][left])
+        return Tile.Empty
+
+    def set(self, position: Position, tile: Tile) -> None:
+        left, top = position
+        if left < 0 or top < 0:
+            raise ValueError(f"Tile can't be drawn at {position}.")
+        if left >= self.width or top >= len(self.rows):
+            self._grow(left, top)
+        self.rows[top][left] = tile.value
+
+    def copy(self) -> "Screen":
+        screen = Screen()
+        screen.width = self.width
+        screen.rows = [bytearray(row) for row in self.rows]
+        return screen
+
+    def lines(self) -> List[str]:
+        return [row.translate(_SYMBOLS_TABLE).decode() for row in self.rows]
+
+    def tiles(self) -> Tiles:
+        return {
+            Position(left, top): Tile(value)
+            for top, row in enumerate(self.rows)
+            for left, value in enumerate(row)
+        }
+
+
 class IOGame(IOHandler):
+    """Game state updated with every drawn tile.
+
+    Positions of the paddle and the ball and number of tiles of every
+    type are kept up to date, so they never have to be searched for.
+    """
 
-    output_values: List[int] = []
+    output_values: List[int]
     relative_base_adjust_value: int = 0
-    tiles: Tiles = {}
-    score: int = 0
+    screen: Screen
+    score: int
+    paddle: Optional[Position]
+    ball: Optional[Position]
+    tile_counts: Dict[Tile, int]
+    renderer: TerminalRenderer
+
+    def __init__(self) -> None:
+        self.output_values = []
+        self.screen = Screen()
+        self.renderer = TerminalRenderer(interactive=True)
+        self.score = 0
+        self.paddle = None
+        self.ball = None
+        self.tile_counts = {tile: 0 for tile in Tile}
+
+    @property
+    def tiles(self) -> Tiles:
+        return self.screen.tiles()
+
+    @property
+    def blocks_left(self) -> int:
+        return self.tile_counts[Tile.Block]
+
+    def copy(self) -> "IOGame":
+        """Independent copy of the game state, sharing only renderer."""
+        game = copy.copy(self)
+        game.output_values = list(self.output_values)
+        game.screen = self.screen.copy()
+        game.tile_counts = dict(self.tile_counts)
+        return game
+
+    def draw(self) -> None:
+        """Draw cells which changed since the last drawn frame."""
+        self.renderer.render(
+            self.screen.lines(), f"Current score: {self.score}"
+        )
 
     def get_input(self) -> int:
-        visualize_table(self.tiles, score=self.score)
+        self.draw()
         move = 100
 
         while move not in (-1, 0, 1):
@@ -98,30 +191,174 @@ class IOGame(IOHandler):
             if left == -1 and top == 0:
                 self.score = value
             else:
-                self.tiles[Position(left, top)] = Tile(id)
+                self._draw(Position(left, top), Tile(id))
 
             self.output_values = []
 
+    def _draw(self, position: Position, tile: Tile) -> None:
+        previous = self.screen.get(position)
+        self.screen.set(position, tile)
+
+        # empty tiles are not counted, screen is full of them
+        if previous != Tile.Empty:
+            self.tile_counts[previous] -= 1
+        if tile != Tile.Empty:
+            self.tile_counts[tile] += 1
+
+        if tile == Tile.HorizontalPaddle:
+            self.paddle = position
+        elif position == self.paddle:
+            self.paddle = None
+
+        if tile == Tile.Ball:
+            self.ball = position
+        elif position == self.ball:
+            self.ball = None
+
 
 class IOGameBot(IOGame):
-    output_values: List[int] = []
-    relative_base_adjust_value: int = 0
-    tiles: Tiles = {}
-    sleep_time: int = 0
+    sleep_time: float
+    # table is drawn on every n-th input, never when it is zero
+    render_every: int
+    frame: int
 
-    def __init__(self, slee_time: int) -> None:
+    def __init__(self, slee_time: float, render_every: int = 1) -> None:
+        super().__init__()
         self.sleep_time = slee_time
+        self.render_every = render_every
+        self.frame = 0
+
+    def show_frame(self, frames: int = 1) -> None:
+        """Count frames which passed, drawing the table when one of them
+        was due to be drawn.
+        """
+        previous, self.frame = self.frame, self.frame + frames
+        every = self.render_every
+        if every and self.frame // every > previous // every:
+            self.draw()
+            # there is nothing to watch in headless mode, so no sleeping
+            time.sleep(self.sleep_time)
 
     def get_input(self) -> int:
-        visualize_table(self.tiles, clear_screen=True, score=self.score)
+        self.show_frame()
 
-        player_pos = find_player_position(self.tiles)
-        ball_pos = find_ball_position(self.tiles)
+        player_pos, ball_pos = self.paddle, self.ball
+        if player_pos is None or ball_pos is None:
+            return 0
 
-        time.sleep(self.sleep_time)
         if player_pos.from_left > ball_pos.from_left:
             return -1
         elif player_pos.from_left < ball_pos.from_left:
             return 1
         else:
             return 0
+
+
+class PredictiveBot(IOGameBot):
+    """Bot which predicts where the ball lands and plans moves ahead.
+
+    Velocity of the ball is taken from its successive positions. When
+    the ball falls with only walls on its way, every move up to its
+    bounce off the paddle is planned at once, so the game can run many
+    frames without asking the bot. Otherwise paddle follows the ball.
+    """
+
+    velocity: Optional[Tuple[int, int]]
+    plans: int
+    _last_ball: Optional[Position]
+    _planned: Deque[int]
+
+    def __init__(self, slee_time: float, render_every: int = 1) -> None:
+        super().__init__(slee_time, render_every)
+        self.velocity = None
+        self.plans = 0
+        self._last_ball = None
+        self._planned = deque()
+
+    def copy(self) -> "PredictiveBot":
+        game = cast(PredictiveBot, super().copy())
+        game._planned = deque(self._planned)
+        return game
+
+    def _draw(self, position: Position, tile: Tile) -> None:
+        super()._draw(position, tile)
+        if tile == Tile.Ball:
+            if self._last_ball is not None:
+                self.velocity = (
+                    position.from_left - self._last_ball.from_left,
+                    position.from_top - self._last_ball.from_top,
+                )
+            self._last_ball = position
+
+    def _landing(self) -> Optional[Tuple[int, int]]:
+        """Column where falling ball gets above the paddle and in how
+        many frames, if there is nothing but walls on its way.
+        """
+        if self.ball is None or self.paddle is None or self.velocity is None:
+            return None
+        dx, dy = self.velocity
+        if dy <= 0:
+            return None
+
+        (x, y), row = self.ball, self.paddle.from_top - 1
+        frames = 0
+        while y < row:
+            side = self.screen.get(Position(x + dx, y))
+            if side == Tile.Wall:
+                dx = -dx
+            elif side != Tile.Empty:
+                return None
+            if any(
+                self.screen.get(Position(column, y + 1)) != Tile.Empty
+                for column in (x, x + dx)
+            ):
+                return None
+            x, y = x + dx, y + 1
+            frames += 1
+        return x, frames
+
+    def plan(self) -> List[int]:
+        """Moves of the joystick for the following frames."""
+        self.plans += 1
+        if self.paddle is None or self.ball is None:
+            return [0]
+
+        paddle = self.paddle.from_left
+        landing = self._landing()
+        if landing is None:
+            ball = self.ball.from_left
+            return [(ball > paddle) - (ball < paddle)]
+
+        # paddle has to be under the ball in the frame it bounces
+        column, frames = landing
+        distance = column - paddle
+        step = (distance > 0) - (distance < 0)
+        moves = [step] * min(abs(distance), frames + 1)
+        return moves + [0] * (frames + 1 - len(moves))
+
+    def get_input(self) -> int:
+        self.show_frame()
+        if not self._planned:
+            self._planned.extend(self.plan())
+        return self._planned.popleft()
+
+
+def play(computer: IntcodeComputer, bot: PredictiveBot) -> int:
+    """Run the game, feeding it whole runs of moves planned by bot.
+
+    Computer executes every frame of a run in one go and bot handles
+    their outputs afterwards, so it is asked only once per run.
+    Returns the final score.
+    """
+    moves: List[int] = []
+    while True:
+        outputs, status = computer.run_until_input(moves)
+        for value in outputs:
+            bot.set_output(value)
+        if status == Status.Halted:
+            return bot.score
+
+        # computer went through a frame for every move, the first one
+        # comes before any move
+        bot.show_frame(len(moves) or 1)
+        moves = bot.plan()
@@ -1,19 +1,37 @@
 #!/usr/bin/env python
 # Beniamin Dudek <beniamin.dudek@yahoo.com, github.com/thinkofher>
 import argparse
+import os
 import sys
-from typing import List
 
+# shared intcode package lives in the root of the repository
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
 
-from computer import IntcodeComputer
-from game import IOGame, IOGameBot, Tile
+
+from intcode import IntcodeComputer, ENGINES, load_intcode, write_image
+from game import (
+    IOGame,
+    IOGameBot,
+    PredictiveBot,
+    PALETTE,
+    play,
+    visualize_table,
+)
+from search import BreakoutSearch, Objective
 
 
 BOT = "bot"
+PREDICTIVE = "predictive"
 PLAYER = "player"
+SEARCH = "search"
 SPEED_MULTIPLIER = 10
 
 
+def save_image(game: IOGame, filename: str) -> None:
+    write_image(filename, game.screen.rows, PALETTE)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Solution for the 11th day of Advent of Code.",
@@ -28,7 +46,7 @@ if __name__ == "__main__":
         type=str,
         help="choose game mode. default is bot",
         default="bot",
-        choices=[BOT, PLAYER],
+        choices=[BOT, PREDICTIVE, PLAYER, SEARCH],
     )
     parser.add_argument(
         "--bot-speed",
@@ -38,41 +56,132 @@ if __name__ == "__main__":
         default=5,
         choices=[1, 2, 3, 4, 5],
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        help="engine executing intcode. default is object",
+        default="object",
+        choices=ENGINES.keys(),
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="don't draw the game and run bot at full speed",
+    )
+    parser.add_argument(
+        "--render-every",
+        type=int,
+        help="draw the game only on every n-th move of bot. default is 1",
+        default=1,
+    )
+    parser.add_argument(
+        "--show-final",
+        action="store_true",
+        help="draw the game once, after it is over",
+    )
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        help="states kept after every frame of search, "
+        "zero keeps all of them. default is 64",
+        default=64,
+    )
+    parser.add_argument(
+        "--max-frames",
+        type=int,
+        help="frames searched at most. default is 100000",
+        default=100000,
+    )
+    parser.add_argument(
+        "--objective",
+        type=str,
+        help="what search looks for. default is moves",
+        default=Objective.FewestMoves.value,
+        choices=[objective.value for objective in Objective],
+    )
+    parser.add_argument(
+        "--image",
+        type=str,
+        help="save the final screen to pbm, pgm or png file",
+    )
     args = parser.parse_args()
 
-    intcode: List[str] = []
-    with open(args.filename, "r") as f:
-        for line in f.readlines():
-            intcode += line.strip("\n").split(",")
+    intcode = load_intcode(args.filename)
 
     computer = IntcodeComputer(intcode)
+    computer.engine = ENGINES[args.engine]()
 
     if args.solve_first:
         computer.io_wrapper = IOGame()
         computer.compute_all()
-        print(
-            len(
-                list(
-                    filter(
-                        lambda tile: tile == Tile.Block,
-                        computer.io_wrapper.tiles.values(),
-                    )
-                )
-            )
-        )
+        if args.image:
+            save_image(computer.io_wrapper, args.image)
+        print(computer.io_wrapper.blocks_left)
         sys.exit(0)
 
     try:
-        intcode[0] = "2"  # game mode
+        intcode[0] = 2  # game mode
         if args.game == BOT:
-            computer.io_wrapper = IOGameBot(1/(SPEED_MULTIPLIER*args.speed))
+            if args.headless:
+                computer.io_wrapper = IOGameBot(0, render_every=0)
+            else:
+                computer.io_wrapper = IOGameBot(
+                    1/(SPEED_MULTIPLIER*args.speed),
+                    render_every=args.render_every,
+                )
             computer.compute_all()
+            if args.show_final:
+                visualize_table(computer.io_wrapper.tiles)
+            if args.image:
+                save_image(computer.io_wrapper, args.image)
             print(f"Final score: {computer.io_wrapper.score}")
             sys.exit(0)
 
+        if args.game == PREDICTIVE:
+            if args.headless:
+                bot = PredictiveBot(0, render_every=0)
+            else:
+                bot = PredictiveBot(
+                    1/(SPEED_MULTIPLIER*args.speed),
+                    render_every=args.render_every,
+                )
+            score = play(computer, bot)
+            if args.show_final:
+                visualize_table(bot.tiles)
+            if args.image:
+                save_image(bot, args.image)
+            print(f"Bot planned {bot.plans} runs of moves.")
+            print(f"Final score: {score}")
+            sys.exit(0)
+
+        if args.game == SEARCH:
+            search = BreakoutSearch(
+                beam_width=args.beam_width or None,
+                max_frames=args.max_frames,
+                objective=Objective(args.objective),
+            )
+            playthrough = search.run(computer)
+            if args.show_final:
+                visualize_table(playthrough.game.tiles)
+            if args.image:
+                save_image(playthrough.game, args.image)
+            print(
+                f"Search explored {search.explored} states, "
+                f"{search.duplicates} of them were already seen."
+            )
+            print(
+                f"{'Won' if playthrough.won else 'Lost'} in "
+                f"{len(playthrough.moves)} moves: "
+                f"{','.join(map(str, playthrough.moves))}"
+            )
+            print(f"Final score: {playthrough.score}")
+            sys.exit(0)
+
         if args.game == PLAYER:
             computer.io_wrapper = IOGame()
             computer.compute_all()
+            if args.image:
+                save_image(computer.io_wrapper, args.image)
             print(f"Final score: {computer.io_wrapper.score}")
             sys.exit(0)
     except KeyboardInterrupt:
@@ -0,0 +1,180 @@
+import enum
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from intcode import IntcodeComputer, Status
+from game import IOGame
+
+MOVES = (-1, 0, 1)
+
+
+@enum.unique
+class Objective(enum.Enum):
+    # break every block with as few inputs as possible
+    FewestMoves = "moves"
+    # get as many points as possible, in any number of inputs
+    HighestScore = "score"
+
+
+class Moves(NamedTuple):
+    """Moves linked from the last one, so states share their history."""
+
+    move: int
+    previous: Optional["Moves"]
+
+
+class State(NamedTuple):
+    computer: IntcodeComputer
+    game: IOGame
+    moves: Optional[Moves]
+
+
+class Playthrough(NamedTuple):
+    moves: List[int]
+    score: int
+    blocks_left: int
+    won: bool
+    game: IOGame
+
+
+def _moves_list(moves: Optional[Moves]) -> List[int]:
+    result = []
+    while moves is not None:
+        result.append(moves.move)
+        moves = moves.previous
+    return result[::-1]
+
+
+def _feed(game: IOGame, outputs: Iterable[int]) -> None:
+    for value in outputs:
+        game.set_output(value)
+
+
+def _playthrough(state: State, won: bool) -> Playthrough:
+    return Playthrough(
+        _moves_list(state.moves),
+        state.game.score,
+        state.game.blocks_left,
+        won,
+        state.game,
+    )
+
+
+def _rank(state: State) -> Tuple[int, int, int]:
+    """Higher is better, states below beam width are dropped."""
+    game = state.game
+    distance = 0
+    if game.paddle is not None and game.ball is not None:
+        distance = abs(game.paddle.from_left - game.ball.from_left)
+    return game.score, -game.blocks_left, -distance
+
+
+def _better(playthrough: Playthrough, other: Optional[Playthrough]) -> bool:
+    if other is None:
+        return True
+    if playthrough.won != other.won:
+        return playthrough.won
+    if playthrough.score != other.score:
+        return playthrough.score > other.score
+    return len(playthrough.moves) < len(other.moves)
+
+
+class BreakoutSearch:
+    """Searches joystick moves, forking the game at every input.
+
+    States are explored frame by frame, so the first won game is also
+    the shortest one. Computers in equal states are skipped by hash of
+    their memory. Without beam width every state is kept, which is a
+    plain breadth-first search, otherwise only the best ones by score,
+    blocks left and distance of the paddle from the ball survive.
+    """
+
+    beam_width: Optional[int]
+    max_frames: int
+    objective: Objective
+    explored: int
+    duplicates: int
+
+    def __init__(
+        self,
+        beam_width: Optional[int] = None,
+        max_frames: int = 100000,
+        objective: Objective = Objective.FewestMoves,
+    ) -> None:
+        self.beam_width = beam_width
+        self.max_frames = max_frames
+        self.objective = objective
+        self.explored = 0
+        self.duplicates = 0
+
+    def _expand(
+        self, state: State, seen: Set[int]
+    ) -> Tuple[List[State], List[State]]:
+        """States after every move, split into playing and finished."""
+        playing, finished = [], []
+        for move in MOVES:
+            computer = state.computer.fork()
+            outputs, status = computer.run_until_input((move,))
+            game = state.game.copy()
+            _feed(game, outputs)
+            self.explored += 1
+
+            child = State(computer, game, Moves(move, state.moves))
+            if status == Status.Halted:
+                finished.append(child)
+                continue
+
+            key = computer.state_hash()
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            playing.append(child)
+        return playing, finished
+
+    def run(self, computer: IntcodeComputer) -> Playthrough:
+        """Find the best playthrough of game loaded into computer.
+
+        Computer itself isn't changed, search runs on its forks. When
+        no game is won, the best unfinished one can be returned.
+        """
+        computer = computer.fork()
+        outputs, status = computer.run_until_input()
+        game = IOGame()
+        _feed(game, outputs)
+        root = State(computer, game, None)
+        if status == Status.Halted:
+            return _playthrough(root, game.blocks_left == 0)
+
+        seen = {computer.state_hash()}
+        frontier = [root]
+        best: Optional[Playthrough] = None
+        for _ in range(self.max_frames):
+            playing: List[State] = []
+            for state in frontier:
+                children, finished = self._expand(state, seen)
+                playing.extend(children)
+                for child in finished:
+                    result = _playthrough(child, child.game.blocks_left == 0)
+                    if _better(result, best):
+                        best = result
+
+            if (
+                best is not None
+                and best.won
+                and self.objective == Objective.FewestMoves
+            ):
+                return best
+            if not playing:
+                break
+
+            if self.beam_width and len(playing) > self.beam_width:
+                playing.sort(key=_rank, reverse=True)
+                del playing[self.beam_width:]
+            frontier = playing
+
+        if best is not None and best.won:
+            return best
+        unfinished = _playthrough(max(frontier, key=_rank), False)
+        if _better(unfinished, best):
+            return unfinished
+        return best  # type: ignore
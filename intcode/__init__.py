@@ -0,0 +1,48 @@
+"""Intcode computer shared by solutions of every intcode day."""
+from .operations import Operation, Parameters
+from .memory import IntcodeMemory, Intcode, ImmutableIntcode
+from .handler import (
+    IOHandler,
+    StdIOWrapper,
+    BatchIOWrapper,
+)
+from .engine import Engine, ObjectEngine, FlatEngine, Status
+from .compiler import CompiledEngine
+from .profiler import Profile, ProfilingEngine
+from .loader import load_intcode, parse_intcode
+from .terminal import TerminalRenderer
+from .image import write_image
+from .computer import (
+    IntcodeComputer,
+    BatchResult,
+    ComputerSnapshot,
+    Coroutine,
+    ENGINES,
+)
+
+__all__ = [
+    "Operation",
+    "Parameters",
+    "IntcodeMemory",
+    "Intcode",
+    "ImmutableIntcode",
+    "IOHandler",
+    "StdIOWrapper",
+    "BatchIOWrapper",
+    "Engine",
+    "ObjectEngine",
+    "FlatEngine",
+    "Status",
+    "CompiledEngine",
+    "Profile",
+    "ProfilingEngine",
+    "load_intcode",
+    "parse_intcode",
+    "IntcodeComputer",
+    "BatchResult",
+    "ComputerSnapshot",
+    "Coroutine",
+    "ENGINES",
+    "TerminalRenderer",
+    "write_image",
+]
@@ -0,0 +1,461 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+from weakref import WeakKeyDictionary
+
+from .operations import Operation, Parameters
+from .decoder import DecodedInstruction
+from .memory import (
+    IntcodeMemory,
+    ImmutableIntcode,
+    Intcode,
+    PAGE_SHIFT,
+)
+from .engine import (
+    Engine,
+    Status,
+    GROWTH_LIMIT,
+    execute_instruction,
+    execute_sparse,
+    far_out,
+    stop_status,
+)
+
+if TYPE_CHECKING:
+    from .computer import IntcodeComputer
+
+# compiled block gets memory list and the computer and returns pointer
+# to the next instruction
+Block = Callable[[Intcode, "IntcodeComputer"], int]
+
+_MAX_BLOCK_LENGTH = 256
+
+# block ends on these and they are always executed by the interpreter
+_INTERPRETED: Tuple[Operation, ...] = (
+    Operation.Input,
+    Operation.Output,
+    Operation.Halt,
+)
+_JUMPS: Tuple[Operation, ...] = (
+    Operation.JumpIfTrue,
+    Operation.JumpIfFalse,
+)
+_WRITING: Tuple[Operation, ...] = (
+    Operation.Add,
+    Operation.Multiply,
+    Operation.LessThan,
+    Operation.Equals,
+    Operation.Input,
+)
+# offset of the operand which holds address written by an instruction
+_WRITE_OFFSETS: Dict[int, int] = {
+    Operation.Add.value: 3,
+    Operation.Multiply.value: 3,
+    Operation.LessThan.value: 3,
+    Operation.Equals.value: 3,
+    Operation.Input.value: 1,
+}
+
+
+def _write_operand(instruction: int) -> Tuple[int, bool]:
+    """Offset of written address operand and if it is relative.
+
+    Offset is zero for instructions which don't write anything.
+    """
+    offset = _WRITE_OFFSETS.get(instruction % 100, 0)
+    mode = instruction // 10 ** (offset + 1) % 10
+    return offset, offset > 0 and mode == Parameters.Relative.value
+
+
+def _read(mode: Parameters, value: int) -> str:
+    if mode == Parameters.Position:
+        return f"mem[{value}]"
+    if mode == Parameters.Immediate:
+        return f"{value}"
+    if mode == Parameters.Relative:
+        return f"mem[rb + {value}]"
+
+    raise ValueError("There is no such a mode.")
+
+
+def _address(mode: Parameters, value: int) -> str:
+    if mode in (Parameters.Position, Parameters.Immediate):
+        return f"{value}"
+    if mode == Parameters.Relative:
+        return f"rb + {value}"
+
+    raise ValueError("There is no such a mode.")
+
+
+def _constant_addresses(decoded: DecodedInstruction) -> List[int]:
+    last = len(decoded.operands) - 1
+    return [
+        value
+        for position, (mode, value) in enumerate(
+            zip(decoded.modes, decoded.operands)
+        )
+        if mode == Parameters.Position
+        or (
+            mode == Parameters.Immediate
+            and position == last
+            and decoded.opcode in _WRITING
+        )
+    ]
+
+
+def _relative_offsets(decoded: DecodedInstruction) -> List[int]:
+    return [
+        value
+        for mode, value in zip(decoded.modes, decoded.operands)
+        if mode == Parameters.Relative
+    ]
+
+
+def _instruction_lines(
+    decoded: DecodedInstruction, ip: int, tracking: bool
+) -> List[str]:
+    """Python source of single instruction with modes and operands baked in.
+
+    Every write is followed by a check whether it landed in compiled
+    code, in which case block stops and invalidates that code.
+    """
+    op, modes, values = decoded.opcode, decoded.modes, decoded.operands
+    next_ip = ip + len(values) + 1
+
+    if op == Operation.AdjustBase:
+        return [f"rb += {_read(modes[0], values[0])}"]
+    if op in _JUMPS:
+        condition = "!=" if op == Operation.JumpIfTrue else "=="
+        return [
+            "vm.relative_base = rb",
+            f"if {_read(modes[0], values[0])} {condition} 0:",
+            f"    return {_read(modes[1], values[1])}",
+            f"return {next_ip}",
+        ]
+
+    first, second = _read(modes[0], values[0]), _read(modes[1], values[1])
+    if op == Operation.Add:
+        value = f"{first} + {second}"
+    elif op == Operation.Multiply:
+        value = f"{first} * {second}"
+    elif op == Operation.LessThan:
+        value = f"1 if {first} < {second} else 0"
+    elif op == Operation.Equals:
+        value = f"1 if {first} == {second} else 0"
+    else:
+        raise ValueError(f"Operation {op} can not be compiled.")
+
+    lines = [
+        f"address = {_address(modes[2], values[2])}",
+        f"mem[address] = {value}",
+    ]
+    if tracking:
+        lines.append(f"dirty.add(address >> {PAGE_SHIFT})")
+    return lines + [
+        "if address in code:",
+        "    vm.relative_base = rb",
+        f"    return invalidate(address, {next_ip})",
+    ]
+
+
+class BlockCache:
+    """Basic blocks compiled for single memory image.
+
+    Block starts at any address execution enters and ends on a jump,
+    before an instruction which has to be interpreted (I/O, halt, code
+    which was overwritten before) or after a write into itself. Writes
+    into compiled code invalidate every block covering written address
+    and the address is never compiled again, so self-modifying parts of
+    programs are executed by the interpreter.
+    """
+
+    memory: IntcodeMemory
+    mem: Intcode
+    tracking: bool
+    blocks: Dict[int, Optional[Block]]
+    code: Set[int]
+    volatile: Set[int]
+    # highest constant address accessed by compiled code
+    reach: int
+    _owners: Dict[int, Set[int]]
+    _spans: Dict[int, range]
+    _images: Dict[int, ImmutableIntcode]
+    # instruction at address, offset of its written address operand
+    # and if it is relative, for instructions run by the interpreter
+    _targets: Dict[int, Tuple[int, int, bool]]
+
+    def __init__(self, memory: IntcodeMemory) -> None:
+        self.memory = memory
+        self.mem = memory.base_memory
+        self.tracking = memory.tracking
+        self.blocks = {}
+        self.code = set()
+        self.volatile = set()
+        self.reach = -1
+        self._owners = {}
+        self._spans = {}
+        self._images = {}
+        self._targets = {}
+
+    def _decode(self, ip: int) -> Optional[DecodedInstruction]:
+        """Decode instruction at ip, if it is safe to compile it."""
+        try:
+            decoded = DecodedInstruction.from_intcode(self.mem[ip:ip + 4])
+        except (ValueError, IndexError):
+            # leave reporting bad instruction to the interpreter
+            return None
+
+        span = range(ip, ip + len(decoded.operands) + 1)
+        if span.stop > len(self.mem) or not self.volatile.isdisjoint(span):
+            return None
+        if decoded.opcode in _INTERPRETED:
+            return None
+
+        constants = _constant_addresses(decoded)
+        if constants:
+            if min(constants) < 0:
+                return None
+            if max(constants) >= len(self.mem) + GROWTH_LIMIT:
+                return None
+            if max(constants) >= len(self.mem):
+                self.memory.grow(max(constants))
+            self.reach = max(self.reach, max(constants))
+        return decoded
+
+    def compile(self, start: int) -> Optional[Block]:
+        # instructions between changes of relative base share single
+        # check that memory is big enough for their relative addresses
+        segments: List[Tuple[int, List[int], List[str]]] = []
+        offsets: List[int] = []
+        lines: List[str] = []
+        segment_start = ip = start
+
+        while ip - start < _MAX_BLOCK_LENGTH:
+            decoded = self._decode(ip)
+            if decoded is None:
+                break
+
+            offsets += _relative_offsets(decoded)
+            lines += _instruction_lines(decoded, ip, self.tracking)
+            next_ip = ip + len(decoded.operands) + 1
+
+            if decoded.opcode in _JUMPS:
+                ip = next_ip
+                break
+            if decoded.opcode == Operation.AdjustBase:
+                segments.append((segment_start, offsets, lines))
+                segment_start, offsets, lines = next_ip, [], []
+            if (
+                decoded.opcode in _WRITING
+                and decoded.modes[-1] != Parameters.Relative
+                and start <= decoded.operands[-1] < next_ip
+            ):
+                # writes into itself, so it can't go any further
+                ip = next_ip
+                break
+            ip = next_ip
+
+        if ip == start:
+            self.blocks[start] = None
+            return None
+
+        if lines or offsets:
+            segments.append((segment_start, offsets, lines))
+        if not (segments and segments[-1][2][-1].startswith("return")):
+            segments[-1][2].append("vm.relative_base = rb")
+            segments[-1][2].append(f"return {ip}")
+
+        block = self._build(start, segments)
+        self._register(start, range(start, ip), block)
+        return block
+
+    def _build(
+        self, start: int, segments: List[Tuple[int, List[int], List[str]]]
+    ) -> Block:
+        body = ["rb = vm.relative_base"]
+        for segment_start, offsets, lines in segments:
+            if offsets:
+                highest = max(offsets)
+                body += [
+                    f"if rb + {highest} >= len(mem):",
+                    "    vm.relative_base = rb",
+                    f"    return reserve(vm, {segment_start}, rb + {highest})",
+                ]
+            body += lines
+
+        name = f"_block_{start}"
+        source = f"def {name}(mem, vm):\n" + "".join(
+            f"    {line}\n" for line in body
+        )
+        namespace: Dict[str, Any] = {
+            "code": self.code,
+            "invalidate": self.invalidate,
+            "reserve": self.reserve,
+            "dirty": self.memory.dirty_pages,
+        }
+        exec(compile(source, f"<intcode {name}>", "exec"), namespace)
+        return cast(Block, namespace[name])
+
+    def _register(self, start: int, span: range, block: Block) -> None:
+        self.blocks[start] = block
+        self._spans[start] = span
+        self._images[start] = tuple(self.mem[span.start:span.stop])
+        for address in span:
+            self._owners.setdefault(address, set()).add(start)
+        self.code.update(span)
+
+    def _drop(self, start: int) -> None:
+        del self.blocks[start]
+        del self._images[start]
+        for covered in self._spans.pop(start):
+            owners = self._owners.get(covered)
+            if owners is not None:
+                owners.discard(start)
+                if not owners:
+                    del self._owners[covered]
+
+    def invalidate(self, address: int, next_ip: int) -> int:
+        """Drop every block covering address and return next_ip."""
+        self.volatile.add(address)
+        for start in self._owners.pop(address, set()):
+            self._drop(start)
+        self.code.intersection_update(self._owners)
+        return next_ip
+
+    def restored(self, ranges: List[range]) -> None:
+        """Drop blocks whose code differs after memory was restored.
+
+        Unlike writes done by the program, restoring a snapshot doesn't
+        make the code volatile, it is simply compiled again.
+        """
+        starts = {
+            start
+            for addresses in ranges
+            for address in addresses
+            for start in self._owners.get(address, ())
+        }
+        for start in starts:
+            span = self._spans[start]
+            if tuple(self.mem[span.start:span.stop]) != self._images[start]:
+                self._drop(start)
+        self.code.intersection_update(self._owners)
+
+    def reserve(
+        self, computer: "IntcodeComputer", ip: int, address: int
+    ) -> int:
+        """Make memory list cover address, before instruction at ip runs.
+
+        Addresses which are too far are handled by the interpreter on
+        sparse memory, for as long as the relative base stays far.
+        """
+        if address < len(self.mem) + GROWTH_LIMIT:
+            self.memory.grow(address)
+            return ip
+
+        ip = self.interpret(computer, ip, execute_sparse)
+        while ip >= 0 and far_out(computer):
+            ip = self.interpret(computer, ip, execute_sparse)
+        return ip
+
+    def interpret(
+        self,
+        computer: "IntcodeComputer",
+        ip: int,
+        execute: Callable[["IntcodeComputer", int], int] = (
+            execute_instruction
+        ),
+    ) -> int:
+        target = self._write_target(ip, computer.relative_base)
+        next_ip = execute(computer, ip)
+        if target in self.code:
+            self.invalidate(target, next_ip)
+        return next_ip
+
+    def _write_target(self, ip: int, relative_base: int) -> Optional[int]:
+        instruction = self.memory[ip]
+        # instruction can be overwritten, so it is checked every time
+        cached = self._targets.get(ip)
+        if cached is None or cached[0] != instruction:
+            cached = self._targets[ip] = (
+                instruction,
+                *_write_operand(instruction),
+            )
+
+        _, offset, relative = cached
+        if not offset:
+            return None
+        address = self.memory[ip + offset]
+        return address + relative_base if relative else address
+
+
+class CompiledEngine(Engine):
+    """Runs program compiled into Python functions, one per basic block.
+
+    Instructions which can't be compiled are executed by the flat
+    interpreter.
+    """
+
+    _caches: "WeakKeyDictionary[IntcodeMemory, BlockCache]"
+
+    def __init__(self) -> None:
+        self._caches = WeakKeyDictionary()
+
+    def _cache_for(self, memory: IntcodeMemory) -> BlockCache:
+        cache = self._caches.get(memory)
+
+        # memory reset replaces whole list, so blocks are outdated, and
+        # blocks have to mark dirty pages once memory takes snapshots
+        if (
+            cache is None
+            or cache.mem is not memory.base_memory
+            or cache.tracking != memory.tracking
+        ):
+            cache = self._caches[memory] = BlockCache(memory)
+        return cache
+
+    def memory_restored(
+        self, computer: "IntcodeComputer", ranges: List[range]
+    ) -> None:
+        memory = computer.intcode_memory
+        cache = self._caches.get(memory)
+        if cache is None or cache.mem is not memory.base_memory:
+            return
+
+        if cache.reach >= len(memory.base_memory):
+            # memory shrank below addresses compiled code relies on
+            del self._caches[memory]
+        else:
+            cache.restored(ranges)
+
+    def run(self, computer: "IntcodeComputer") -> Status:
+        memory = computer.intcode_memory
+        cache = self._cache_for(memory)
+        blocks = cache.blocks
+        mem = memory.base_memory
+        ip = computer._computer_instruction_ptr
+
+        try:
+            while ip >= 0:
+                try:
+                    block = blocks[ip]
+                except KeyError:
+                    block = cache.compile(ip)
+
+                if block is None:
+                    ip = cache.interpret(computer, ip)
+                else:
+                    ip = block(mem, computer)
+        finally:
+            # memory was changed behind the back of decoded instructions
+            computer.instruction_cache.clear()
+
+        computer._computer_instruction_ptr = ~ip
+        return stop_status(memory, ~ip)
@@ -0,0 +1,220 @@
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Type,
+    Union,
+)
+
+from .operations import Operation
+from .singlecode import SingleCode
+from .memory import ImmutableIntcode, Intcode
+from .handler import IOHandler, StdIOWrapper, BatchIOWrapper
+from .memory import IntcodeMemory, MemorySnapshot
+from .decoder import InstructionCache
+from .engine import Engine, ObjectEngine, FlatEngine, Status
+from .compiler import CompiledEngine
+from .profiler import ProfilingEngine
+
+
+class BatchResult(NamedTuple):
+    outputs: List[int]
+    status: Status
+
+
+class ComputerSnapshot(NamedTuple):
+    memory: MemorySnapshot
+    instruction_ptr: int
+    relative_base: int
+    io_wrapper: IOHandler
+
+
+# generator yields outputs and statuses and receives inputs
+Coroutine = Generator[Union[int, Status], Optional[int], None]
+
+
+class IntcodeComputer:
+
+    io_wrapper: IOHandler = StdIOWrapper()
+    engine: Engine = ObjectEngine()
+
+    _computer_instruction_ptr: int
+    init_intcode: ImmutableIntcode
+    intcode: Intcode
+    relative_base: int
+    instruction_cache: InstructionCache
+    _running: bool
+    # reused by every run_until_input call
+    _batch: BatchIOWrapper
+
+    def __init__(self, intcode: Intcode) -> None:
+        self.intcode_memory = IntcodeMemory(intcode)
+        self.instruction_cache = InstructionCache(self.intcode_memory)
+        self._computer_instruction_ptr = 0
+        self.relative_base = 0
+        self._running = False
+        self._batch = BatchIOWrapper()
+
+    def reset_computer(self) -> None:
+        self._step = 0
+        self._computer_instruction_ptr = 0
+        self.relative_base = 0
+        self.intcode_memory.reset()
+        self.instruction_cache.clear()
+
+    def compute_step(self) -> Operation:
+        ptr = self._computer_instruction_ptr
+
+        code = SingleCode.from_decoded(
+            self.instruction_cache.fetch(ptr), self.relative_base,
+        )
+        code.instruction_pointer = ptr
+        self._computer_instruction_ptr = code.execute(
+            self.intcode_memory, self.io_wrapper
+        )
+
+        # read relative value saved to io_wrapper
+        self.relative_base += self.io_wrapper.relative_base_adjust_value
+
+        # reset relative base adjust value of io_wrapper
+        self.io_wrapper.relative_base_adjust_value = 0
+        return code.operation
+
+    def snapshot(self) -> ComputerSnapshot:
+        """Save state of the computer, so it can be restored later.
+
+        Memory pages are shared between snapshots until they are written,
+        so snapshots are cheap even for big programs.
+        """
+        if self._running:
+            raise RuntimeError("Can't take snapshot of running computer.")
+        return ComputerSnapshot(
+            self.intcode_memory.snapshot(),
+            self._computer_instruction_ptr,
+            self.relative_base,
+            self.io_wrapper.copy(),
+        )
+
+    def restore(self, snapshot: ComputerSnapshot) -> None:
+        """Bring computer back to snapshot, copying only changed pages.
+
+        Snapshot can be restored any number of times and is much faster
+        than reset_computer for programs which write only few pages.
+        """
+        if self._running:
+            raise RuntimeError("Can't restore snapshot of running computer.")
+        ranges = self.intcode_memory.restore(snapshot.memory)
+        self._computer_instruction_ptr = snapshot.instruction_ptr
+        self.relative_base = snapshot.relative_base
+        self.io_wrapper = snapshot.io_wrapper.copy()
+        self.instruction_cache.clear()
+        self.engine.memory_restored(self, ranges)
+
+    def fork(self) -> "IntcodeComputer":
+        """Independent computer which continues from the current state.
+
+        Both computers share engine, everything else is copied, so they
+        can run different inputs without affecting each other. Memory is
+        forked from its snapshot, so pages which neither computer writes
+        are shared between them.
+        """
+        if self._running:
+            raise RuntimeError("Can't fork running computer.")
+        computer = IntcodeComputer.__new__(IntcodeComputer)
+        computer.intcode_memory = self.intcode_memory.fork()
+        computer.instruction_cache = InstructionCache(computer.intcode_memory)
+        computer._computer_instruction_ptr = self._computer_instruction_ptr
+        computer.relative_base = self.relative_base
+        computer._running = False
+        computer._batch = BatchIOWrapper()
+        computer.engine = self.engine
+        computer.io_wrapper = self.io_wrapper.copy()
+        return computer
+
+    def state_hash(self) -> int:
+        """Hash of everything which decides what program does next.
+
+        Computers with equal hashes put out the same values for the same
+        inputs, so search can skip states it has already seen.
+        """
+        return hash(
+            (
+                self.intcode_memory.state_hash(),
+                self._computer_instruction_ptr,
+                self.relative_base,
+            )
+        )
+
+    def _run_engine(self) -> Status:
+        self._running = True
+        try:
+            return self.engine.run(self)
+        finally:
+            self._running = False
+
+    def compute_all(self) -> IOHandler:
+        self._run_engine()
+        return self.io_wrapper
+
+    def run_until_input(self, inputs: Iterable[int] = ()) -> BatchResult:
+        """Run program until it halts or runs out of given inputs.
+
+        Outputs are collected into a list instead of being passed one by
+        one to io_wrapper, which is left untouched.
+        """
+        batch = self._batch
+        batch.reset(inputs)
+        outputs = batch.output_values
+        io_wrapper, self.io_wrapper = self.io_wrapper, batch
+        try:
+            status = self._run_engine()
+        finally:
+            self.io_wrapper = io_wrapper
+            # don't keep inputs and outputs alive until the next batch
+            batch.reset(())
+        return BatchResult(outputs, status)
+
+    def run_until_halt(self, inputs: Iterable[int] = ()) -> List[int]:
+        outputs, status = self.run_until_input(inputs)
+        if status != Status.Halted:
+            raise ValueError("Computer needs more input values to halt.")
+        return outputs
+
+    def coroutine(self, inputs: Iterable[int] = ()) -> Coroutine:
+        """Run program as a generator.
+
+        Generator yields output values and Status.NeedsInput, when program
+        waits for input, which has to be given with send(). Values sent
+        at any other moment are queued as next inputs. Status.Halted is
+        the last yielded value. Program runs in batches between yields,
+        so there is no per instruction overhead.
+        """
+        pending: List[int] = list(inputs)
+        while True:
+            outputs, status = self.run_until_input(pending)
+            pending = []
+
+            for value in outputs:
+                sent = yield value
+                if sent is not None:
+                    pending.append(sent)
+
+            if status == Status.Halted:
+                yield Status.Halted
+                return
+
+            while not pending:
+                sent = yield Status.NeedsInput
+                if sent is not None:
+                    pending.append(sent)
+
+
+ENGINES: Dict[str, Type[Engine]] = {
+    "object": ObjectEngine,
+    "flat": FlatEngine,
+    "compiled": CompiledEngine,
+    "profile": ProfilingEngine,
+}
@@ -0,0 +1,77 @@
+from typing import Dict, NamedTuple, Set, Tuple
+
+from .operations import Operation, Parameters
+from .values import Modes
+from .memory import IntcodeMemory, Intcode
+
+
+class DecodedInstruction(NamedTuple):
+    opcode: Operation
+    modes: Tuple[Parameters, ...]
+    operands: Tuple[int, ...]
+
+    @classmethod
+    def from_intcode(cls, intcode_slice: Intcode) -> "DecodedInstruction":
+        modes = Modes.from_intcode(intcode_slice)
+        operands = intcode_slice[1:len(modes.parameters) + 1]
+        return cls(modes.opcode, modes.parameters, tuple(operands))
+
+    @property
+    def span(self) -> int:
+        # opcode cell followed by one cell for every operand
+        return len(self.operands) + 1
+
+
+class InstructionCache:
+    """Decoded instructions keyed by the address of their opcode.
+
+    Every cell covered by a cached instruction is watched in memory, so
+    a write landing inside an instruction (self-modifying programs)
+    drops it from the cache and it gets decoded again on next fetch.
+    """
+
+    memory: IntcodeMemory
+    instructions: Dict[int, DecodedInstruction]
+    _owners: Dict[int, Set[int]]
+
+    def __init__(self, memory: IntcodeMemory) -> None:
+        self.memory = memory
+        self.instructions = {}
+        self._owners = {}
+
+    def fetch(self, ptr: int) -> DecodedInstruction:
+        try:
+            return self.instructions[ptr]
+        except KeyError:
+            pass
+
+        memory = self.memory
+        if ptr + 4 <= len(memory.base_memory):
+            cells = memory.base_memory[ptr:ptr + 4]
+        else:
+            # instruction reaches beyond the list, into sparse pages
+            cells = [memory[address] for address in range(ptr, ptr + 4)]
+        decoded = DecodedInstruction.from_intcode(cells)
+        self.instructions[ptr] = decoded
+        for address in range(ptr, ptr + decoded.span):
+            self._owners.setdefault(address, set()).add(ptr)
+            self.memory.watchers[address] = self.invalidate
+        return decoded
+
+    def invalidate(self, address: int) -> None:
+        for ptr in self._owners.get(address, set()).copy():
+            decoded = self.instructions.pop(ptr)
+            for covered in range(ptr, ptr + decoded.span):
+                owners = self._owners[covered]
+                owners.discard(ptr)
+                if not owners:
+                    del self._owners[covered]
+                    del self.memory.watchers[covered]
+
+    def clear(self) -> None:
+        # fast engines clear cache after every run, mostly empty one
+        if not self.instructions:
+            return
+        self.instructions = {}
+        self._owners = {}
+        self.memory.watchers = {}
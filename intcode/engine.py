@@ -0,0 +1,353 @@
+import enum
+from abc import ABC, abstractmethod
+from itertools import product
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+    cast,
+)
+
+from .operations import Operation, Parameters
+from .decoder import DecodedInstruction
+from .memory import IntcodeMemory, Intcode, PAGE_SHIFT
+
+if TYPE_CHECKING:
+    from .computer import IntcodeComputer
+
+# handler gets memory list, instruction pointer and the computer itself
+# and returns pointer to the next instruction
+Handler = Callable[[Intcode, int, "IntcodeComputer"], int]
+# the same, but working on IntcodeMemory instead of its list
+SparseHandler = Callable[[IntcodeMemory, int, "IntcodeComputer"], int]
+
+# instructions are at most five digits long (three modes and an opcode)
+_TABLE_SIZE = 100000
+
+# how far beyond the current end of memory it is still worth growing
+# the flat memory list instead of falling back to the sparse storage
+GROWTH_LIMIT = 1 << 16
+
+
+@enum.unique
+class Status(enum.Enum):
+    NeedsInput = 0
+    Halted = 1
+
+
+_HALT = Operation.Halt.value
+
+
+def stop_status(memory: IntcodeMemory, ip: int) -> Status:
+    """Tell why engine stopped at the instruction under ip."""
+    mem = memory.base_memory
+    instruction = mem[ip] if ip < len(mem) else memory[ip]
+    if instruction % 100 == _HALT:
+        return Status.Halted
+    return Status.NeedsInput
+
+
+class Engine(ABC):
+    """Strategy used by IntcodeComputer to execute its program.
+
+    Engine runs until the program halts or until io_wrapper returns
+    None from get_input, which means there is no input available yet.
+    """
+
+    @abstractmethod
+    def run(self, computer: "IntcodeComputer") -> Status:
+        pass
+
+    def memory_restored(
+        self, computer: "IntcodeComputer", ranges: List[range]
+    ) -> None:
+        """Called after given ranges of memory were restored from snapshot."""
+
+
+class ObjectEngine(Engine):
+    """Executes program one SingleCode object at a time."""
+
+    def run(self, computer: "IntcodeComputer") -> Status:
+        while True:
+            ptr = computer._computer_instruction_ptr
+            operation = computer.compute_step()
+
+            if operation == Operation.Halt:
+                return Status.Halted
+            if (
+                operation == Operation.Input
+                and ptr == computer._computer_instruction_ptr
+            ):
+                return Status.NeedsInput
+
+
+def _read(mode: Parameters, offset: int) -> str:
+    if mode == Parameters.Position:
+        return f"mem[mem[ip + {offset}]]"
+    if mode == Parameters.Immediate:
+        return f"mem[ip + {offset}]"
+    if mode == Parameters.Relative:
+        return f"mem[mem[ip + {offset}] + vm.relative_base]"
+
+    raise ValueError("There is no such a mode.")
+
+
+def _address(mode: Parameters, offset: int) -> str:
+    if mode in (Parameters.Position, Parameters.Immediate):
+        return f"mem[ip + {offset}]"
+    if mode == Parameters.Relative:
+        return f"mem[ip + {offset}] + vm.relative_base"
+
+    raise ValueError("There is no such a mode.")
+
+
+def _write(address: str, value: str, tracking: bool) -> List[str]:
+    if not tracking:
+        return [f"mem[{address}] = {value}"]
+    return [
+        f"address = {address}",
+        f"mem[address] = {value}",
+        f"vm.intcode_memory.dirty_pages.add(address >> {PAGE_SHIFT})",
+    ]
+
+
+def _handler_body(
+    op: Operation,
+    modes: Tuple[Parameters, ...],
+    tracking: bool,
+    sparse: bool,
+) -> List[str]:
+    if op == Operation.Add:
+        a, b, c = _read(modes[0], 1), _read(modes[1], 2), _address(modes[2], 3)
+        return _write(c, f"{a} + {b}", tracking) + ["return ip + 4"]
+    if op == Operation.Multiply:
+        a, b, c = _read(modes[0], 1), _read(modes[1], 2), _address(modes[2], 3)
+        return _write(c, f"{a} * {b}", tracking) + ["return ip + 4"]
+    if op == Operation.LessThan:
+        a, b, c = _read(modes[0], 1), _read(modes[1], 2), _address(modes[2], 3)
+        value = f"1 if {a} < {b} else 0"
+        return _write(c, value, tracking) + ["return ip + 4"]
+    if op == Operation.Equals:
+        a, b, c = _read(modes[0], 1), _read(modes[1], 2), _address(modes[2], 3)
+        value = f"1 if {a} == {b} else 0"
+        return _write(c, value, tracking) + ["return ip + 4"]
+    if op == Operation.JumpIfTrue:
+        a, b = _read(modes[0], 1), _read(modes[1], 2)
+        return [f"return {b} if {a} != 0 else ip + 3"]
+    if op == Operation.JumpIfFalse:
+        a, b = _read(modes[0], 1), _read(modes[1], 2)
+        return [f"return {b} if {a} == 0 else ip + 3"]
+    if op == Operation.Input:
+        # list has to be big enough before input value is consumed,
+        # sparse memory takes any address
+        bounds_check = [
+            "if address >= len(mem):",
+            "    raise IndexError(address)",
+        ]
+        return [
+            f"address = {_address(modes[0], 1)}",
+            *([] if sparse else bounds_check),
+            "value = vm.io_wrapper.get_input()",
+            # no input available yet, so stop at this instruction
+            "if value is None:",
+            "    return ~ip",
+            *_write("address", "value", tracking),
+            "return ip + 2",
+        ]
+    if op == Operation.Output:
+        return [
+            f"vm.io_wrapper.set_output({_read(modes[0], 1)})",
+            "return ip + 2",
+        ]
+    if op == Operation.AdjustBase:
+        return [f"vm.relative_base += {_read(modes[0], 1)}", "return ip + 2"]
+    if op == Operation.Halt:
+        # complement of the pointer is negative, which stops the loop,
+        # and still tells at which address computer stopped
+        return ["return ~ip"]
+
+    raise ValueError(f"There is no operation like {op}")
+
+
+def _compile_handler(
+    op: Operation,
+    modes: Tuple[Parameters, ...],
+    tracking: bool,
+    sparse: bool,
+) -> Handler:
+    name = f"_{op.name.lower()}_" + "".join(str(m.value) for m in modes)
+    source = f"def {name}(mem, ip, vm):\n" + "".join(
+        f"    {line}\n"
+        for line in _handler_body(op, modes, tracking, sparse)
+    )
+    namespace: Dict[str, Handler] = {}
+    exec(compile(source, f"<intcode {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _bad_instruction(mem: Intcode, ip: int, vm: "IntcodeComputer") -> int:
+    raise ValueError(f"Bad instruction: {mem[ip]}.")
+
+
+def _build_dispatch_table(
+    tracking: bool, sparse: bool = False
+) -> List[Handler]:
+    table: List[Handler] = [_bad_instruction] * _TABLE_SIZE
+    for op in Operation:
+        params_count = len(
+            DecodedInstruction.from_intcode([op.value, 0, 0, 0]).operands
+        )
+        for modes in product(Parameters, repeat=params_count):
+            handler = _compile_handler(op, modes, tracking, sparse)
+
+            # digits of modes which operation doesn't use are ignored
+            unused_modes = product(range(10), repeat=3 - params_count)
+            for unused in unused_modes:
+                digits = tuple(m.value for m in modes) + unused
+                instruction = op.value + sum(
+                    digit * 10 ** (position + 2)
+                    for position, digit in enumerate(digits)
+                )
+                table[instruction] = handler
+    return table
+
+
+_DISPATCH_TABLE = _build_dispatch_table(tracking=False)
+# handlers which also mark pages they write to as dirty
+_TRACKING_DISPATCH_TABLE = _build_dispatch_table(tracking=True)
+# handlers working on IntcodeMemory itself instead of its list, which
+# reach sparse pages and mark dirty pages on their own
+_SPARSE_DISPATCH_TABLE = cast(
+    List[SparseHandler], _build_dispatch_table(tracking=False, sparse=True)
+)
+
+
+def dispatch_table(memory: IntcodeMemory) -> List[Handler]:
+    if memory.tracking:
+        return _TRACKING_DISPATCH_TABLE
+    return _DISPATCH_TABLE
+
+
+_WRITING_OPERATIONS: Tuple[Operation, ...] = (
+    Operation.Add,
+    Operation.Multiply,
+    Operation.LessThan,
+    Operation.Equals,
+    Operation.Input,
+)
+
+
+def _touched_addresses(
+    memory: IntcodeMemory, ip: int, relative_base: int
+) -> Iterator[int]:
+    decoded = DecodedInstruction.from_intcode(
+        [memory[address] for address in range(ip, ip + 4)]
+    )
+    yield from range(ip, ip + decoded.span)
+
+    last = len(decoded.operands) - 1
+    for position, (mode, value) in enumerate(
+        zip(decoded.modes, decoded.operands)
+    ):
+        if mode == Parameters.Relative:
+            yield value + relative_base
+        elif mode == Parameters.Position:
+            yield value
+        elif position == last and decoded.opcode in _WRITING_OPERATIONS:
+            # immediate mode write target is treated as position
+            yield value
+
+
+def beyond_memory(
+    computer: "IntcodeComputer", ip: int, error: IndexError
+) -> int:
+    """Handle instruction at ip, which failed to access memory list.
+
+    List grows, when it is close enough, otherwise the instruction is
+    executed on sparse memory. Returns pointer of the instruction to
+    execute next.
+    """
+    memory = computer.intcode_memory
+    size = len(memory.base_memory)
+    highest = max(_touched_addresses(memory, ip, computer.relative_base))
+
+    if highest < size:
+        # nothing was out of bounds, so error comes from somewhere else
+        raise error
+
+    if highest < size + GROWTH_LIMIT:
+        memory.grow(highest)
+        return ip
+    return execute_sparse(computer, ip)
+
+
+def execute_sparse(computer: "IntcodeComputer", ip: int) -> int:
+    """Execute single instruction on memory with its sparse pages."""
+    memory = computer.intcode_memory
+    return _SPARSE_DISPATCH_TABLE[memory[ip]](memory, ip, computer)
+
+
+def far_out(computer: "IntcodeComputer") -> bool:
+    """Tell if relative base is too far to grow memory list up to it."""
+    limit = len(computer.intcode_memory.base_memory) + GROWTH_LIMIT
+    return computer.relative_base >= limit
+
+
+def run_sparse(computer: "IntcodeComputer", ip: int) -> int:
+    """Execute instructions on sparse memory while relative base is far.
+
+    Returns pointer of the instruction to execute next, which is
+    negative when program stopped.
+    """
+    memory = computer.intcode_memory
+    table = _SPARSE_DISPATCH_TABLE
+    while ip >= 0 and far_out(computer):
+        ip = table[memory[ip]](memory, ip, computer)
+    return ip
+
+
+def execute_instruction(computer: "IntcodeComputer", ip: int) -> int:
+    """Execute single instruction with its flat handler."""
+    memory = computer.intcode_memory
+    mem = memory.base_memory
+    try:
+        return dispatch_table(memory)[mem[ip]](mem, ip, computer)
+    except IndexError as error:
+        return beyond_memory(computer, ip, error)
+
+
+class FlatEngine(Engine):
+    """Runs program in a single loop over precompiled instruction handlers.
+
+    Every combination of opcode and parameter modes gets its own handler
+    with modes baked in, so executing an instruction is a single list
+    lookup and function call. Memory is accessed as a plain list, which
+    grows on demand. Instructions touching addresses far beyond the
+    end of the list are executed by handlers working on the sparse
+    memory, which stay in use as long as the relative base is far.
+    """
+
+    def run(self, computer: "IntcodeComputer") -> Status:
+        memory = computer.intcode_memory
+        table = dispatch_table(memory)
+        ip = computer._computer_instruction_ptr
+
+        try:
+            while ip >= 0:
+                mem = memory.base_memory
+                try:
+                    while ip >= 0:
+                        ip = table[mem[ip]](mem, ip, computer)
+                except IndexError as error:
+                    ip = run_sparse(
+                        computer, beyond_memory(computer, ip, error)
+                    )
+        finally:
+            # memory was changed behind the back of decoded instructions
+            computer.instruction_cache.clear()
+
+        computer._computer_instruction_ptr = ~ip
+        return stop_status(memory, ~ip)
@@ -0,0 +1,57 @@
+from copy import deepcopy
+from functools import partial
+from typing import Iterable, Iterator, Optional, List
+from abc import ABC, abstractmethod
+
+
+class IOHandler(ABC):
+
+    output_values: List[int] = []
+    relative_base_adjust_value: int = 0
+
+    @abstractmethod
+    def get_input(self) -> Optional[int]:
+        # None means that there is no input yet and computer should stop
+        pass
+
+    def set_output(self, value: int) -> None:
+        self.output_values.append(value)
+
+    def copy(self) -> "IOHandler":
+        """Independent copy for snapshots and forks of the computer.
+
+        Handlers holding anything which can't be deep copied, like open
+        files, override it.
+        """
+        return deepcopy(self)
+
+
+class StdIOWrapper(IOHandler):
+    def get_input(self) -> int:
+        input_value = input("Enter input: ")
+        return int(input_value)
+
+    def set_output(self, value: int) -> None:
+        print(value)
+
+
+class BatchIOWrapper(IOHandler):
+    """Takes inputs from iterable and collects outputs into a list."""
+
+    inputs: Iterator[int]
+
+    def __init__(self, inputs: Iterable[int] = ()) -> None:
+        self.relative_base_adjust_value = 0
+        self.reset(inputs)
+
+    def reset(self, inputs: Iterable[int]) -> None:
+        """Start the next batch, so wrapper doesn't have to be created."""
+        self.inputs = iter(inputs)
+        self.output_values = []
+
+        # builtins called directly, without any python level call
+        self.get_input = partial(next, self.inputs, None)  # type: ignore
+        self.set_output = self.output_values.append  # type: ignore
+
+    def get_input(self) -> Optional[int]:
+        return next(self.inputs, None)
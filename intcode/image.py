@@ -0,0 +1,95 @@
+import os
+import struct
+import zlib
+from typing import Optional, Sequence, Tuple, Union
+
+Color = Tuple[int, int, int]
+# rows of cells, one byte per cell
+Rows = Sequence[Union[bytes, bytearray]]
+
+
+def _size(rows: Rows) -> Tuple[int, int]:
+    width = len(rows[0]) if rows else 0
+    if any(len(row) != width for row in rows):
+        raise ValueError("All rows of image have to be equally long.")
+    # none of the formats can hold an image without any cell
+    if not width:
+        raise ValueError("Image has no cells to save.")
+    return width, len(rows)
+
+
+def pbm(rows: Rows) -> bytes:
+    """Binary bitmap, cells other than zero are black."""
+    width, height = _size(rows)
+    # every row is turned into text of bits, padded to whole bytes
+    ink = bytes.maketrans(bytes(range(256)), b"0" + b"1" * 255)
+    padding = b"0" * (-width % 8)
+    row_size = (width + 7) // 8
+    packed = [
+        int(bytes(row).translate(ink) + padding, 2).to_bytes(row_size, "big")
+        for row in rows
+    ]
+    return f"P4\n{width} {height}\n".encode() + b"".join(packed)
+
+
+def pgm(rows: Rows, maxval: Optional[int] = None) -> bytes:
+    """Binary graymap, cells are gray levels up to maxval.
+
+    Maxval is the highest cell by default, so every level is visible.
+    """
+    width, height = _size(rows)
+    if maxval is None:
+        maxval = max(max(row) for row in rows) or 1
+    header = f"P5\n{width} {height}\n{maxval}\n".encode()
+    return header + b"".join(rows)
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def png(
+    rows: Rows, palette: Optional[Sequence[Color]] = None
+) -> bytes:
+    """PNG image, with cells indexing palette or as gray levels."""
+    width, height = _size(rows)
+    color_type = 0 if palette is None else 3
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+
+    # every row starts with filter type, which is none here
+    data = zlib.compress(b"".join(b"\0" + bytes(row) for row in rows))
+    chunks = [_chunk(b"IHDR", header)]
+    if palette is not None:
+        chunks.append(
+            _chunk(b"PLTE", b"".join(bytes(color) for color in palette))
+        )
+    chunks += [_chunk(b"IDAT", data), _chunk(b"IEND", b"")]
+    return b"\x89PNG\r\n\x1a\n" + b"".join(chunks)
+
+
+def write_image(
+    filename: str,
+    rows: Rows,
+    palette: Optional[Sequence[Color]] = None,
+) -> None:
+    """Save grid of cells to pbm, pgm or png file, by its extension.
+
+    Palette is used only by png, other formats take cells as they are.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".pbm":
+        content = pbm(rows)
+    elif extension == ".pgm":
+        content = pgm(rows)
+    elif extension == ".png":
+        content = png(rows, palette)
+    else:
+        raise ValueError(f"Unknown image format of {filename}.")
+
+    with open(filename, "wb") as f:
+        f.write(content)
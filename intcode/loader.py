@@ -0,0 +1,174 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from .memory import Intcode
+
+# binary form of parsed program is saved next to its text file
+CACHE_SUFFIX = ".icache"
+
+_MAGIC = b"INTCODE\x01"
+# magic, size and mtime of the text file, its sha1, count of values and
+# count of escaped values
+_HEADER = struct.Struct("<8sQQ20sQQ")
+# values which don't fit into int64 are replaced with the lowest int64
+# and stored as text after the array
+_ESCAPE = -(1 << 63)
+_INT64_LIMIT = 1 << 63
+
+_CHUNK_SIZE = 1 << 16
+
+
+def parse_intcode(filename: str, chunk_size: int = _CHUNK_SIZE) -> Intcode:
+    """Parse program from text file, reading it in chunks.
+
+    Only a single chunk of text is kept in memory at once, so memory
+    used by parsing is proportional to the number of values.
+    """
+    intcode: Intcode = []
+    rest = ""
+    with open(filename, "r") as f:
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            # lines are just continuation of the program
+            chunk = rest + chunk.replace("\n", ",")
+
+            # last value could be split between two chunks
+            cut = chunk.rfind(",")
+            if cut < 0:
+                rest = chunk
+                continue
+            values = chunk[:cut].split(",")
+            if "" in values:
+                # blank lines and trailing commas leave empty values
+                values = list(filter(None, values))
+            intcode.extend(map(int, values))
+            rest = chunk[cut + 1:]
+
+    if rest.strip():
+        intcode.append(int(rest))
+    return intcode
+
+
+def _file_digest(filename: str) -> bytes:
+    digest = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _encode(intcode: Intcode) -> Tuple[array, List[Tuple[int, int]]]:
+    escaped = [
+        (index, value)
+        for index, value in enumerate(intcode)
+        if not _ESCAPE < value < _INT64_LIMIT
+    ]
+    if not escaped:
+        return array("q", intcode), escaped
+
+    values = array(
+        "q",
+        (
+            value if _ESCAPE < value < _INT64_LIMIT else _ESCAPE
+            for value in intcode
+        ),
+    )
+    return values, escaped
+
+
+def _write_cache(
+    cache_path: str, filename: str, intcode: Intcode, source: os.stat_result
+) -> None:
+    values, escaped = _encode(intcode)
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    header = _HEADER.pack(
+        _MAGIC,
+        source.st_size,
+        source.st_mtime_ns,
+        _file_digest(filename),
+        len(values),
+        len(escaped),
+    )
+    escapes = "".join(f"{index} {value}\n" for index, value in escaped)
+
+    # other process could read half written cache, so it is replaced
+    # in a single step
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as f:
+            f.write(header)
+            values.tofile(f)
+            f.write(escapes.encode())
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        # caching is only an optimization, so read-only directories
+        # and full disks are not errors
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+def _read_cache(
+    cache_path: str, filename: str, source: os.stat_result
+) -> Optional[Intcode]:
+    try:
+        with open(cache_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            return _decode(mapped, filename, source)
+    except (OSError, ValueError, struct.error):
+        # missing, empty or broken cache is just parsed again
+        return None
+
+
+def _decode(
+    mapped: mmap.mmap, filename: str, source: os.stat_result
+) -> Optional[Intcode]:
+    magic, size, mtime, digest, count, escapes = _HEADER.unpack_from(mapped)
+    if magic != _MAGIC:
+        return None
+    if (size, mtime) != (source.st_size, source.st_mtime_ns):
+        # file was touched, but its content could still be the same
+        if digest != _file_digest(filename):
+            return None
+
+    start = _HEADER.size
+    stop = start + count * 8
+    if stop > len(mapped):
+        return None
+    values = array("q")
+    with memoryview(mapped) as view, view[start:stop] as data:
+        values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    intcode = values.tolist()
+
+    for line in mapped[stop:].decode().splitlines()[:escapes]:
+        index, value = line.split(" ")
+        intcode[int(index)] = int(value)
+    return intcode
+
+
+def load_intcode(filename: str, use_cache: bool = True) -> Intcode:
+    """Load program from text file, through its binary cache.
+
+    Cache is valid as long as size and mtime of the text file are the
+    same, or its content has the same hash.
+    """
+    if not use_cache:
+        return parse_intcode(filename)
+
+    source = os.stat(filename)
+    cache_path = filename + CACHE_SUFFIX
+    intcode = _read_cache(cache_path, filename, source)
+    if intcode is None:
+        intcode = parse_intcode(filename)
+        _write_cache(cache_path, filename, intcode, source)
+    return intcode
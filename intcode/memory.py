@@ -0,0 +1,266 @@
+from typing import Callable, Dict, NamedTuple, Optional, Set, Tuple, List
+
+Intcode = List[int]
+ImmutableIntcode = Tuple[int, ...]
+WriteListener = Callable[[int], None]
+
+# memory is split into pages of 256 cells, base memory for snapshots
+# and memory beyond it for sparse storage
+PAGE_SHIFT = 8
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+
+# hashes of pages are kept for pages of the last snapshot, zero pages
+# are marked with None, since they don't count
+PageHashes = Dict[int, Optional[int]]
+
+
+class MemorySnapshot(NamedTuple):
+    size: int
+    # pages which didn't change are shared with previous snapshots
+    pages: Tuple[ImmutableIntcode, ...]
+    sparse_pages: Dict[int, ImmutableIntcode]
+
+
+class MemoryUsage(NamedTuple):
+    base_cells: int
+    sparse_pages: int
+
+    @property
+    def sparse_cells(self) -> int:
+        return self.sparse_pages * PAGE_SIZE
+
+    @property
+    def total_cells(self) -> int:
+        return self.base_cells + self.sparse_cells
+
+
+class IntcodeMemory:
+
+    _init_memory: ImmutableIntcode
+    base_memory: Intcode
+    # memory beyond base memory, allocated by pages on the first write
+    sparse_pages: Dict[int, Intcode]
+    watchers: Dict[int, WriteListener]
+
+    # when tracking is on, every write to base memory has to add
+    # its page to dirty pages, engines check it before they start
+    tracking: bool
+    dirty_pages: Set[int]
+    _baseline: Optional[MemorySnapshot]
+    # hashes of pages in the last snapshot, which may be shared with
+    # memories forked from it
+    _page_hashes: PageHashes
+
+    def __init__(self, intcode: Intcode) -> None:
+        self._init_memory = tuple(intcode)
+        self.base_memory = intcode
+        self.sparse_pages = {}
+        self.watchers = {}
+        self.tracking = False
+        self.dirty_pages = set()
+        self._baseline = None
+        self._page_hashes = {}
+
+    def __getitem__(self, key: int) -> int:
+        if key < len(self.base_memory):
+            return self.base_memory[key]
+
+        page = self.sparse_pages.get(key >> PAGE_SHIFT)
+        if page is None:
+            # default value of memory which was never written
+            return 0
+        return page[key & PAGE_MASK]
+
+    def __setitem__(self, key: int, value: int) -> None:
+        if key < len(self.base_memory):
+            self.base_memory[key] = value
+            if self.tracking:
+                self.dirty_pages.add(key >> PAGE_SHIFT)
+        else:
+            index = key >> PAGE_SHIFT
+            page = self.sparse_pages.get(index)
+            if page is None:
+                page = self.sparse_pages[index] = [0] * PAGE_SIZE
+            page[key & PAGE_MASK] = value
+
+        # notify whoever cached data derived from this cell
+        if key in self.watchers:
+            self.watchers[key](key)
+
+    def grow(self, address: int) -> None:
+        """Extend base memory, so it covers given address."""
+        start = len(self.base_memory)
+        self.base_memory.extend(
+            self[key] for key in range(start, address + 1)
+        )
+
+        # sparse pages fully covered by base memory are never read again
+        covered = (address + 1) >> PAGE_SHIFT
+        for index in [index for index in self.sparse_pages if index < covered]:
+            del self.sparse_pages[index]
+
+    def usage(self) -> MemoryUsage:
+        return MemoryUsage(len(self.base_memory), len(self.sparse_pages))
+
+    def fork(self) -> "IntcodeMemory":
+        """Independent memory built from a snapshot of this one.
+
+        Both memories share pages of the snapshot and their hashes, so
+        only pages written afterwards are copied or hashed again.
+        Watchers belong to caches of this memory, so they aren't copied.
+        """
+        snapshot = self.snapshot()
+        memory = IntcodeMemory.__new__(IntcodeMemory)
+        memory._init_memory = self._init_memory
+        # list has the same content as the snapshot, copying it is faster
+        memory.base_memory = list(self.base_memory)
+        memory.sparse_pages = {
+            index: list(page) for index, page in self.sparse_pages.items()
+        }
+        memory.watchers = {}
+        memory.tracking = True
+        memory.dirty_pages = set()
+        memory._baseline = snapshot
+        memory._page_hashes = self._page_hashes
+        return memory
+
+    def _page_hash(self, index: int) -> Optional[int]:
+        """Hash of cells of the page, wherever they are stored."""
+        start = index << PAGE_SHIFT
+        cells = self.base_memory[start:start + PAGE_SIZE]
+        if len(cells) < PAGE_SIZE:
+            # page is cut by the end of the list, the rest is sparse
+            rest = self.sparse_pages.get(index, [0] * PAGE_SIZE)
+            cells += rest[len(cells):]
+        return hash(tuple(cells)) if any(cells) else None
+
+    def state_hash(self) -> int:
+        """Hash of memory content, same for memories with equal cells.
+
+        Memory is hashed by pages, no matter if they are in the list or
+        sparse, and pages of zeros are skipped, so the size of the list
+        doesn't count. Hashes of pages not written since the last
+        snapshot are reused.
+        """
+        size = len(self.base_memory)
+        baseline = self._baseline
+        # full pages of the last snapshot can be written only if dirty
+        reusable = 0 if baseline is None else min(size, baseline.size)
+        reusable >>= PAGE_SHIFT
+        hashes, dirty = self._page_hashes, self.dirty_pages
+
+        pages: List[Tuple[int, int]] = []
+        for index in range((size + PAGE_MASK) >> PAGE_SHIFT):
+            if index < reusable and index not in dirty:
+                if index not in hashes:
+                    hashes[index] = self._page_hash(index)
+                page_hash = hashes[index]
+            else:
+                page_hash = self._page_hash(index)
+            if page_hash is not None:
+                pages.append((index, page_hash))
+
+        count = (size + PAGE_MASK) >> PAGE_SHIFT
+        pages += [
+            (index, hash(tuple(page)))
+            for index, page in sorted(self.sparse_pages.items())
+            if index >= count and any(page)
+        ]
+        return hash(tuple(pages))
+
+    def reset(self) -> None:
+        self.base_memory = list(self._init_memory)
+        self.sparse_pages = {}
+        self.watchers = {}
+        self._baseline = None
+        self._page_hashes = {}
+
+    def _is_clean(self, index: int, size: int) -> bool:
+        """Tell if page has the same content as in the last snapshot."""
+        baseline = self._baseline
+        if baseline is None or index in self.dirty_pages:
+            return False
+        if index >= len(baseline.pages):
+            return False
+
+        # page which was cut by the end of memory could grow since then
+        page_size = min(PAGE_SIZE, size - (index << PAGE_SHIFT))
+        return len(baseline.pages[index]) == page_size
+
+    def snapshot(self) -> MemorySnapshot:
+        """Save memory, copying only pages written since last snapshot.
+
+        Taking the first snapshot turns on tracking of dirty pages.
+        """
+        mem = self.base_memory
+        size = len(mem)
+        baseline = self._baseline
+        if baseline is not None and not self.dirty_pages and (
+            baseline.size == size
+        ):
+            # nothing was written to the list since the last snapshot
+            pages = baseline.pages
+        else:
+            pages = tuple(
+                baseline.pages[index]  # type: ignore
+                if self._is_clean(index, size)
+                else tuple(mem[start:start + PAGE_SIZE])
+                for index, start in enumerate(range(0, size, PAGE_SIZE))
+            )
+        sparse_pages = {
+            index: tuple(page) for index, page in self.sparse_pages.items()
+        }
+        snapshot = MemorySnapshot(size, pages, sparse_pages)
+
+        self._rebase(snapshot)
+        return snapshot
+
+    def restore(self, snapshot: MemorySnapshot) -> List[range]:
+        """Bring memory back to the snapshot, in place.
+
+        Only pages which were written since the last snapshot, or which
+        differ between the last snapshot and this one, are copied.
+        Returns address ranges which were restored.
+        """
+        mem = self.base_memory
+        if len(mem) > snapshot.size:
+            del mem[snapshot.size:]
+        elif len(mem) < snapshot.size:
+            mem.extend([0] * (snapshot.size - len(mem)))
+
+        baseline = self._baseline
+        restored: List[range] = []
+        for index, page in enumerate(snapshot.pages):
+            if (
+                baseline is not None
+                and index not in self.dirty_pages
+                and index < len(baseline.pages)
+                and baseline.pages[index] is page
+            ):
+                continue
+            start = index << PAGE_SHIFT
+            mem[start:start + len(page)] = page
+            restored.append(range(start, start + len(page)))
+
+        self.sparse_pages = {
+            index: list(page) for index, page in snapshot.sparse_pages.items()
+        }
+        self._rebase(snapshot)
+        return restored
+
+    def _rebase(self, snapshot: MemorySnapshot) -> None:
+        """Make snapshot the last one, keeping hashes of shared pages."""
+        baseline, hashes = self._baseline, self._page_hashes
+        self._page_hashes = {}
+        if baseline is not None:
+            self._page_hashes = {
+                index: page_hash
+                for index, page_hash in hashes.items()
+                if index < len(snapshot.pages)
+                and index < len(baseline.pages)
+                and snapshot.pages[index] is baseline.pages[index]
+            }
+        self._baseline = snapshot
+        self.dirty_pages.clear()
+        self.tracking = True
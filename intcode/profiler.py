@@ -0,0 +1,137 @@
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Iterator, Tuple
+
+from .operations import Operation
+from .engine import Engine, Status, execute_instruction, stop_status
+
+if TYPE_CHECKING:
+    from .computer import IntcodeComputer
+
+# basic block ends after these, whether jump is taken or not
+_BLOCK_ENDS = (
+    Operation.JumpIfTrue.value,
+    Operation.JumpIfFalse.value,
+    Operation.Input.value,
+    Operation.Output.value,
+)
+
+
+class Profile:
+    """Counters collected by ProfilingEngine."""
+
+    opcodes: "Counter[int]"
+    addresses: "Counter[int]"
+    blocks: "Counter[int]"
+    # address of block, address of instruction inside it and its opcode
+    stacks: "Counter[Tuple[int, int, int]]"
+    inputs: int
+    outputs: int
+    wall_time: float
+
+    def __init__(self) -> None:
+        self.opcodes = Counter()
+        self.addresses = Counter()
+        self.blocks = Counter()
+        self.stacks = Counter()
+        self.inputs = 0
+        self.outputs = 0
+        self.wall_time = 0.0
+
+    @property
+    def instructions(self) -> int:
+        return sum(self.opcodes.values())
+
+    def report(self, top: int = 10) -> str:
+        """Hot spots of the program as human readable text."""
+        total = self.instructions or 1
+        speed = self.instructions / self.wall_time if self.wall_time else 0
+        lines = [
+            f"{self.instructions} instructions in {self.wall_time:.3f}s "
+            f"({speed:.0f}/s), {self.inputs} inputs, "
+            f"{self.outputs} outputs",
+            "",
+            "Opcodes:",
+        ]
+        lines += [
+            f"  {Operation(opcode).name:<12} {count:>12} "
+            f"{100 * count / total:6.2f}%"
+            for opcode, count in self.opcodes.most_common()
+        ]
+        lines += ["", f"Top {top} addresses:"]
+        lines += [
+            f"  {address:>8} {count:>12} {100 * count / total:6.2f}%"
+            for address, count in self.addresses.most_common(top)
+        ]
+        lines += ["", f"Top {top} basic blocks (entries):"]
+        lines += [
+            f"  {address:>8} {count:>12}"
+            for address, count in self.blocks.most_common(top)
+        ]
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> Iterator[str]:
+        """Lines of collapsed stack format, as read by flamegraph.pl."""
+        for (block, address, opcode), count in sorted(self.stacks.items()):
+            name = Operation(opcode).name
+            yield f"intcode;block_{block};{name}_{address} {count}"
+
+    def write_collapsed_stacks(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            for line in self.collapsed_stacks():
+                f.write(line + "\n")
+
+
+class ProfilingEngine(Engine):
+    """Flat interpreter which counts everything it executes.
+
+    It is a separate engine, so other engines don't pay anything for
+    profiling. Counters are accumulated in profile across runs.
+    """
+
+    profile: Profile
+
+    def __init__(self) -> None:
+        self.profile = Profile()
+
+    def run(self, computer: "IntcodeComputer") -> Status:
+        profile = self.profile
+        opcodes, addresses = profile.opcodes, profile.addresses
+        blocks, stacks = profile.blocks, profile.stacks
+        memory = computer.intcode_memory
+        ip = computer._computer_instruction_ptr
+        block = ip
+        blocks[block] += 1
+        started = time.perf_counter()
+
+        try:
+            while ip >= 0:
+                opcode = memory[ip] % 100
+                size = len(memory.base_memory)
+                next_ip = execute_instruction(computer, ip)
+                if next_ip == ip and size != len(memory.base_memory):
+                    # memory had to grow, so instruction runs again
+                    continue
+                if next_ip < 0 and opcode != Operation.Halt.value:
+                    # waits for input, so it wasn't executed
+                    ip = next_ip
+                    break
+
+                opcodes[opcode] += 1
+                addresses[ip] += 1
+                stacks[block, ip, opcode] += 1
+                if opcode == Operation.Input.value:
+                    profile.inputs += 1
+                elif opcode == Operation.Output.value:
+                    profile.outputs += 1
+
+                if opcode in _BLOCK_ENDS and next_ip >= 0:
+                    block = next_ip
+                    blocks[block] += 1
+                ip = next_ip
+        finally:
+            profile.wall_time += time.perf_counter() - started
+            computer.instruction_cache.clear()
+
+        computer._computer_instruction_ptr = ~ip
+        return stop_status(memory, ~ip)
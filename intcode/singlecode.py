@@ -1,15 +1,16 @@
 from typing import Tuple
 
-from handler import IOHandler
-from operations import (
+from .handler import IOHandler
+from .operations import (
     Operation,
     OperationType,
     SingleParameter,
     TwoParameters,
     ThreeParametrs,
 )
-from values import WrappedValue, Modes, Intcode
-from memory import IntcodeMemory
+from .values import WrappedValue, Modes, Intcode
+from .memory import IntcodeMemory
+from .decoder import DecodedInstruction
 
 
 def wrap_values(
@@ -46,8 +47,16 @@ class SingleCode:
     def from_intcode(
         cls, intcode_slice: Intcode, relative_base: int
     ) -> "SingleCode":
-        modes = Modes.from_intcode(intcode_slice)
-        values: Tuple[int, ...] = tuple(map(int, intcode_slice[1:]))
+        return cls.from_decoded(
+            DecodedInstruction.from_intcode(intcode_slice), relative_base
+        )
+
+    @classmethod
+    def from_decoded(
+        cls, decoded: DecodedInstruction, relative_base: int
+    ) -> "SingleCode":
+        modes = Modes(decoded.opcode, decoded.modes)
+        values = decoded.operands
 
         if modes.opcode == Operation.Halt:
             return cls._halt_code(modes)
@@ -122,7 +131,7 @@ class SingleCode:
         if self.operation == Operation.AdjustBase:
             return self._adjust_relative_base(intcode_memory, io_handler)
         if self.operation == Operation.Halt:
-            return self._HALT_STEP
+            return self._HALT_STEP + self.instruction_pointer
 
         raise ValueError(f"There is no operation like {self.operation}")
 
@@ -139,20 +148,23 @@ class SingleCode:
         return self.target_adress.get_value(mem, OperationType.Write)
 
     def _add(self, mem: IntcodeMemory) -> int:
-        mem[self._write_target_adress(mem)] = str(
+        mem[self._write_target_adress(mem)] = (
             self._calc_first_value(mem) + self._calc_second_value(mem)
         )
         return self._OPERATION_STEP + self.instruction_pointer
 
     def _multiply(self, mem: IntcodeMemory) -> int:
-        mem[self._write_target_adress(mem)] = str(
+        mem[self._write_target_adress(mem)] = (
             self._calc_first_value(mem) * self._calc_second_value(mem)
         )
         return self._OPERATION_STEP + self.instruction_pointer
 
     def _input(self, mem: IntcodeMemory, io_handler: IOHandler) -> int:
         input_value = io_handler.get_input()
-        mem[self._write_target_adress(mem)] = str(input_value)
+        if input_value is None:
+            # no input available yet, so instruction has to be repeated
+            return self.instruction_pointer
+        mem[self._write_target_adress(mem)] = input_value
         return self._INPUT_OUTPUT_STEP + self.instruction_pointer
 
     def _output(self, mem: IntcodeMemory, io_handler: IOHandler) -> int:
@@ -176,9 +188,9 @@ class SingleCode:
         adress = self._write_target_adress(mem)
 
         if first < second:
-            mem[adress] = str(1)
+            mem[adress] = 1
         else:
-            mem[adress] = str(0)
+            mem[adress] = 0
         return self._OPERATION_STEP + self.instruction_pointer
 
     def _equals(self, mem: IntcodeMemory) -> int:
@@ -187,9 +199,9 @@ class SingleCode:
         adress = self._write_target_adress(mem)
 
         if first == second:
-            mem[adress] = str(1)
+            mem[adress] = 1
         else:
-            mem[adress] = str(0)
+            mem[adress] = 0
         return self._OPERATION_STEP + self.instruction_pointer
 
     def _adjust_relative_base(
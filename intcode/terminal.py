@@ -0,0 +1,78 @@
+import sys
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+_CLEAR = "\033[2J"
+
+
+def _move(row: int, column: int) -> str:
+    # ANSI rows and columns start at one
+    return f"\033[{row + 1};{column + 1}H"
+
+
+class TerminalRenderer:
+    """Draws frames of a character grid, each with a single write.
+
+    In interactive mode renderer remembers the last frame and updates
+    only cells which changed, moving the cursor with ANSI escapes.
+    Otherwise frames are simply written one after another.
+    """
+
+    stream: TextIO
+    interactive: bool
+    _previous: Optional[List[str]]
+
+    def __init__(
+        self, stream: Optional[TextIO] = None, interactive: bool = False
+    ) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+        self.interactive = interactive
+        self._previous = None
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "TerminalRenderer":
+        # stream can't be copied, so copies write to the same one
+        renderer = TerminalRenderer(self.stream, self.interactive)
+        if self._previous is not None:
+            renderer._previous = list(self._previous)
+        memo[id(self)] = renderer
+        return renderer
+
+    def render(self, rows: Sequence[str], status: str = "") -> None:
+        if not self.interactive:
+            lines = list(rows) + ([status] if status else [])
+            self.stream.write("\n".join(lines) + "\n")
+        else:
+            self.stream.write(self._diff(list(rows) + [status]))
+        self.stream.flush()
+
+    def _diff(self, rows: List[str]) -> str:
+        previous = self._previous
+        self._previous = rows
+        if previous is None or len(previous) != len(rows):
+            return _CLEAR + _move(0, 0) + "\n".join(rows) + "\n"
+
+        parts: List[str] = []
+        for number, (old, new) in enumerate(zip(previous, rows)):
+            if old == new:
+                continue
+            if len(old) != len(new):
+                parts.append(_move(number, 0) + new + "\033[K")
+                continue
+
+            # every run of changed cells needs only one cursor move
+            column = 0
+            while column < len(new):
+                if old[column] == new[column]:
+                    column += 1
+                    continue
+                start = column
+                while column < len(new) and old[column] != new[column]:
+                    column += 1
+                parts.append(_move(number, start) + new[start:column])
+
+        # leave cursor below the frame, on a clean line
+        parts.append(_move(len(rows), 0) + "\033[K")
+        return "".join(parts)
+
+    def reset(self) -> None:
+        """Draw the whole next frame again."""
+        self._previous = None
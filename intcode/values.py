@@ -1,7 +1,7 @@
 from typing import NamedTuple, Tuple, List
 
-from operations import Operation, OperationType, Parameters
-from memory import IntcodeMemory, Intcode
+from .operations import Operation, OperationType, Parameters
+from .memory import IntcodeMemory, Intcode
 
 
 class Modes(NamedTuple):
@@ -10,10 +10,14 @@ class Modes(NamedTuple):
 
     @classmethod
     def from_intcode(cls, intcode_slice: Intcode) -> "Modes":
-        opcode_str: str = intcode_slice[0]
+        instruction: int = intcode_slice[0]
+        if instruction < 0:
+            raise ValueError(
+                f"Instruction ({instruction}) can not be a negative number."
+            )
 
-        # opcode (operation) is in the two last element of string
-        opcode: int = int(opcode_str[-2:])
+        # opcode (operation) is in the two last digits of instruction
+        modes_value, opcode = divmod(instruction, 100)
 
         additional_values: int = 0
 
@@ -30,11 +34,12 @@ class Modes(NamedTuple):
                 f"Opcode ({opcode}) can only be 1, 2, 3, 4, 5, 6, 7, 8, 9 or 99."
             )
 
-        values_parameters: List[int] = list(map(int, opcode_str[:-2]))
-        values_parameters.reverse()
-
-        # add zeros omitted due to being a leading zero
-        values_parameters += (additional_values - len(values_parameters)) * [0]
+        # modes are read from the lowest digit, so omitted leading zeros
+        # come out as position mode parameters
+        values_parameters: List[int] = []
+        for _ in range(additional_values):
+            modes_value, mode = divmod(modes_value, 10)
+            values_parameters.append(mode)
 
         return cls(
             Operation(opcode), tuple(map(Parameters, values_parameters))
@@ -62,11 +67,11 @@ class WrappedValue(NamedTuple):
 
     def _handle_read_operation(self, intcode_memory: IntcodeMemory) -> int:
         if self.mode == Parameters.Position:
-            return int(intcode_memory[self.value])
+            return intcode_memory[self.value]
         if self.mode == Parameters.Immediate:
             return self.value
         if self.mode == Parameters.Relative:
-            return int(intcode_memory[self.value + self.relative_base])
+            return intcode_memory[self.value + self.relative_base]
 
         raise ValueError("There is no such a mode.")
 